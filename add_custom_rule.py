@@ -3,7 +3,143 @@
 展示如何添加新的评分规则
 """
 
-from plate_scorer import ScoringRule, ScoreResult, PlateScorer, create_default_scorer
+from typing import Dict, List, Optional, Tuple
+
+from plate_scorer import (
+    ScoringRule,
+    ScoreResult,
+    PlateContext,
+    PlateBatch,
+    PlateScorer,
+    create_default_scorer,
+)
+
+
+# ==================== 数字扫描 ====================
+# 单个车牌直接用 Python 扫描；批量评分时改用整批编译的内核（需安装 numba），
+# 逐个车牌调用编译内核的开销反而比扫描本身大
+
+
+def _longest_palindrome(digits: str) -> Tuple[int, int]:
+    """
+    最左最长的回文子串（至少3位）
+
+    返回:
+        (起始下标, 长度)，没有则长度为0
+    """
+    n = len(digits)
+    for length in range(n, 2, -1):
+        for start in range(n - length + 1):
+            lo, hi = start, start + length - 1
+            while lo < hi and digits[lo] == digits[hi]:
+                lo += 1
+                hi -= 1
+            if lo >= hi:
+                return start, length
+    return 0, 0
+
+
+def _longest_decreasing_run(values: Tuple[int, ...]) -> int:
+    """最长的逐位减1连续序列长度"""
+    max_sequence = current_sequence = 1
+    for i in range(1, len(values)):
+        if values[i] + 1 == values[i - 1]:
+            current_sequence += 1
+            if current_sequence > max_sequence:
+                max_sequence = current_sequence
+        else:
+            current_sequence = 1
+    return max_sequence
+
+
+def _find_patterns(digits: str, values: Tuple[int, ...]) -> Tuple[int, int, int]:
+    """
+    一次遍历查找 AABB / ABAB / ABC 模式
+
+    返回:
+        (AABB起始下标, ABAB起始下标, ABC起始下标)，未找到为-1；
+        找到 AABB 后立即返回（优先级最高）
+    """
+    n = len(digits)
+    abab_at = abc_at = -1
+
+    for i in range(n - 2):
+        if i < n - 3:
+            b0, b1, b2, b3 = digits[i], digits[i + 1], digits[i + 2], digits[i + 3]
+            if b0 == b1 and b2 == b3 and b0 != b2:
+                return i, abab_at, abc_at
+            if abab_at < 0 and b0 == b2 and b1 == b3 and b0 != b1:
+                abab_at = i
+        if (
+            abc_at < 0
+            and values[i + 1] == values[i] + 1
+            and values[i + 2] == values[i + 1] + 1
+        ):
+            abc_at = i
+
+    return -1, abab_at, abc_at
+
+
+def _palindrome_spans(digits, lengths, out):
+    """
+    批量版 _longest_palindrome，逐行写入 out[r] = (起始下标, 长度)
+
+    只使用整数运算和下标访问，供 numba 编译；digits/lengths 见 PlateBatch。
+    """
+    for r in range(digits.shape[0]):
+        d = digits[r]
+        n = lengths[r]
+        found = False
+        for length in range(n, 2, -1):
+            for start in range(n - length + 1):
+                lo = start
+                hi = start + length - 1
+                while lo < hi and d[lo] == d[hi]:
+                    lo += 1
+                    hi -= 1
+                if lo >= hi:
+                    out[r, 0] = start
+                    out[r, 1] = length
+                    found = True
+                    break
+            if found:
+                break
+
+
+def _pattern_starts(digits, lengths, out):
+    """
+    批量版 _find_patterns，逐行写入 out[r] = (AABB, ABAB, ABC 起始下标)
+
+    out 需预先填为-1；供 numba 编译。
+    """
+    for r in range(digits.shape[0]):
+        d = digits[r]
+        n = lengths[r]
+        for i in range(n - 2):
+            if i < n - 3:
+                if d[i] == d[i + 1] and d[i + 2] == d[i + 3] and d[i] != d[i + 2]:
+                    out[r, 0] = i
+                    break
+                if out[r, 1] < 0 and d[i] == d[i + 2] and d[i + 1] == d[i + 3]:
+                    if d[i] != d[i + 1]:
+                        out[r, 1] = i
+            if out[r, 2] < 0 and d[i + 1] == d[i] + 1 and d[i + 2] == d[i + 1] + 1:
+                out[r, 2] = i
+
+
+_KERNELS: Dict[str, object] = {}
+
+
+def _kernel(func):
+    """首次使用时用 numba 编译批量内核；未安装 numba 时返回 None"""
+    if func.__name__ not in _KERNELS:
+        try:
+            from numba import njit
+        except ImportError:
+            _KERNELS[func.__name__] = None
+        else:
+            _KERNELS[func.__name__] = njit(cache=True, nogil=True)(func)
+    return _KERNELS[func.__name__]
 
 
 # ==================== 自定义规则示例 ====================
@@ -15,9 +151,10 @@ class Rule8_AvoidNumber7(ScoringRule):
     def __init__(self):
         super().__init__("避免数字7", weight=1.0)
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
-        count_7 = digits.count("7")
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        count_7 = self.get_context(plate_number, ctx).digit_hist[7]
 
         if count_7 == 0:
             return ScoreResult(self.name, 5 * self.weight, "无数字7 (+5)")
@@ -31,51 +168,92 @@ class Rule8_AvoidNumber7(ScoringRule):
 class Rule9_PalindromeNumber(ScoringRule):
     """示例规则9: 回文数字（对称数字）"""
 
+    min_digits = 3
+
     def __init__(self):
         super().__init__("回文数字", weight=1.0)
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if len(digits) < 3:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         if digits == digits[::-1]:
+            return self._result(digits, 0, len(digits))
+
+        # 检查部分回文（最长的回文子串）
+        return self._result(digits, *_longest_palindrome(digits))
+
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        kernel = _kernel(_palindrome_spans)
+        if kernel is None:
+            return super().calculate_many(batch)
+
+        import numpy as np
+
+        spans = np.zeros((len(batch), 2), dtype=np.int64)
+        kernel(batch.digits, batch.lengths.astype(np.int64), spans)
+
+        return [
+            self._result(ctx.digits, int(start), int(length))
+            if len(ctx.digits) >= self.min_digits
+            else self._few_digits
+            for ctx, (start, length) in zip(batch.contexts, spans)
+        ]
+
+    def _result(self, digits: str, start: int, length: int) -> ScoreResult:
+        if length == len(digits):
             score = 35
             return ScoreResult(
                 self.name, score * self.weight, f"完美回文 {digits} (+{score})"
             )
-        else:
-            # 检查部分回文
-            for length in range(len(digits), 2, -1):
-                for i in range(len(digits) - length + 1):
-                    substring = digits[i : i + length]
-                    if substring == substring[::-1] and length >= 3:
-                        score = (length - 2) * 8
-                        return ScoreResult(
-                            self.name,
-                            score * self.weight,
-                            f"部分回文 {substring} (+{score})",
-                        )
-
-            return ScoreResult(self.name, 0, "无回文")
+        if length >= 3:
+            score = (length - 2) * 8
+            return ScoreResult(
+                self.name,
+                score * self.weight,
+                f"部分回文 {digits[start : start + length]} (+{score})",
+            )
+        return ScoreResult(self.name, 0, "无回文")
 
 
 class Rule10_SumDivisibleBy(ScoringRule):
     """示例规则10: 数字之和能被特定数整除"""
 
+    min_digits = 1
+    few_digits_reason = "无数字"
+
     def __init__(self, divisor: int = 10):
         super().__init__(f"数字和能被{divisor}整除", weight=1.0)
         self.divisor = divisor
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
+
+        if len(ctx.digits) < self.min_digits:
+            return self._few_digits
 
-        if not digits:
-            return ScoreResult(self.name, 0, "无数字")
+        digit_sum = sum(ctx.digit_ints)
+        return self._result(digit_sum)
 
-        digit_sum = sum(int(d) for d in digits)
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        import numpy as np
 
+        # 填充位(255)按0计，整批一次求和
+        arr = batch.digits
+        sums = np.where(arr == PlateBatch.PAD, 0, arr).sum(axis=1)
+
+        return [
+            self._result(int(digit_sum)) if length else self._few_digits
+            for digit_sum, length in zip(sums, batch.lengths)
+        ]
+
+    def _result(self, digit_sum: int) -> ScoreResult:
         if digit_sum % self.divisor == 0:
             score = 15
             return ScoreResult(
@@ -88,25 +266,41 @@ class Rule10_SumDivisibleBy(ScoringRule):
 class Rule11_DecreasingSequence(ScoringRule):
     """示例规则11: 递减序列"""
 
+    min_digits = 2
+
     def __init__(self):
         super().__init__("递减序列", weight=1.0)
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
+
+        if len(ctx.digits) < self.min_digits:
+            return self._few_digits
 
-        if len(digits) < 2:
-            return ScoreResult(self.name, 0, "数字不足")
+        return self._result(_longest_decreasing_run(ctx.digit_ints))
 
-        max_sequence = 1
-        current_sequence = 1
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        import numpy as np
 
-        for i in range(1, len(digits)):
-            if int(digits[i]) == int(digits[i - 1]) - 1:
-                current_sequence += 1
-                max_sequence = max(max_sequence, current_sequence)
-            else:
-                current_sequence = 1
+        arr = batch.digits.astype(np.int16)
+        if arr.shape[1] < 2:
+            return [self._few_digits] * len(batch.contexts)
 
+        # 相邻差为-1即递减一步；填充位255不会与任何数字构成-1
+        is_dec = np.diff(arr, axis=1) == -1
+        # 最长连续True：当前下标减去最近一次False的下标
+        idx = np.arange(is_dec.shape[1])
+        last_break = np.maximum.accumulate(np.where(is_dec, -1, idx), axis=1)
+        longest = (idx - last_break).max(axis=1)
+
+        return [
+            self._result(int(run) + 1) if length >= 2 else self._few_digits
+            for run, length in zip(longest, batch.lengths)
+        ]
+
+    def _result(self, max_sequence: int) -> ScoreResult:
         if max_sequence >= 3:
             score = (max_sequence - 2) * 18
             return ScoreResult(
@@ -119,55 +313,62 @@ class Rule11_DecreasingSequence(ScoringRule):
 class Rule12_SpecificPattern(ScoringRule):
     """示例规则12: 特定数字模式（如AABB, ABAB等）"""
 
+    min_digits = 4
+
     def __init__(self):
         super().__init__("特殊数字模式", weight=1.0)
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
-
-        if len(digits) < 4:
-            return ScoreResult(self.name, 0, "数字不足")
-
-        # AABB 模式
-        if len(digits) >= 4:
-            for i in range(len(digits) - 3):
-                if (
-                    digits[i] == digits[i + 1]
-                    and digits[i + 2] == digits[i + 3]
-                    and digits[i] != digits[i + 2]
-                ):
-                    score = 25
-                    pattern = f"{digits[i]}{digits[i]}{digits[i+2]}{digits[i+3]}"
-                    return ScoreResult(
-                        self.name, score * self.weight, f"AABB模式 {pattern} (+{score})"
-                    )
-
-        # ABAB 模式
-        if len(digits) >= 4:
-            for i in range(len(digits) - 3):
-                if (
-                    digits[i] == digits[i + 2]
-                    and digits[i + 1] == digits[i + 3]
-                    and digits[i] != digits[i + 1]
-                ):
-                    score = 28
-                    pattern = f"{digits[i]}{digits[i+1]}{digits[i]}{digits[i+1]}"
-                    return ScoreResult(
-                        self.name, score * self.weight, f"ABAB模式 {pattern} (+{score})"
-                    )
-
-        # ABC 模式（如123, 234, 345）
-        if len(digits) >= 3:
-            for i in range(len(digits) - 2):
-                if (
-                    int(digits[i + 1]) == int(digits[i]) + 1
-                    and int(digits[i + 2]) == int(digits[i + 1]) + 1
-                ):
-                    score = 20
-                    pattern = f"{digits[i]}{digits[i+1]}{digits[i+2]}"
-                    return ScoreResult(
-                        self.name, score * self.weight, f"ABC模式 {pattern} (+{score})"
-                    )
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
+
+        if len(ctx.digits) < self.min_digits:
+            return self._few_digits
+
+        # 一次遍历同时查找三种模式，优先级 AABB > ABAB > ABC
+        return self._result(ctx.digits, *_find_patterns(ctx.digits, ctx.digit_ints))
+
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        kernel = _kernel(_pattern_starts)
+        if kernel is None:
+            return super().calculate_many(batch)
+
+        import numpy as np
+
+        starts = np.full((len(batch), 3), -1, dtype=np.int64)
+        kernel(batch.digits, batch.lengths.astype(np.int64), starts)
+
+        return [
+            self._result(ctx.digits, int(aabb_at), int(abab_at), int(abc_at))
+            if len(ctx.digits) >= self.min_digits
+            else self._few_digits
+            for ctx, (aabb_at, abab_at, abc_at) in zip(batch.contexts, starts)
+        ]
+
+    def _result(
+        self, digits: str, aabb_at: int, abab_at: int, abc_at: int
+    ) -> ScoreResult:
+        if aabb_at >= 0:
+            score = 25
+            pattern = digits[aabb_at : aabb_at + 4]
+            return ScoreResult(
+                self.name, score * self.weight, f"AABB模式 {pattern} (+{score})"
+            )
+
+        if abab_at >= 0:
+            score = 28
+            pattern = digits[abab_at : abab_at + 4]
+            return ScoreResult(
+                self.name, score * self.weight, f"ABAB模式 {pattern} (+{score})"
+            )
+
+        if abc_at >= 0:
+            score = 20
+            pattern = digits[abc_at : abc_at + 3]
+            return ScoreResult(
+                self.name, score * self.weight, f"ABC模式 {pattern} (+{score})"
+            )
 
         return ScoreResult(self.name, 0, "无特殊模式")
 
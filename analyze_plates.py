@@ -3,14 +3,124 @@
 输入图片地址，自动识别车牌并进行评分排序
 """
 
-import sys
 import os
+import argparse
+import importlib.util
 import re
-from typing import List, Tuple
+import queue
+import threading
+from typing import Dict, List, Tuple
 from plate_scorer import create_default_scorer
 from dataclasses import dataclass
 
 
+# 是否安装了 easyocr（只查找模块，不在启动时加载 torch 等重量级依赖）
+_HAS_EASYOCR = importlib.util.find_spec("easyocr") is not None
+
+# EasyOCR Reader 缓存，key为(语言元组, 是否使用GPU, 是否开启cuDNN调优)
+# 加载模型权重耗时较长，同一进程内多次识别时复用同一个实例
+_READER_CACHE: Dict[Tuple[Tuple[str, ...], bool, bool], object] = {}
+
+# OCR 识别字符白名单
+PLATE_ALLOWLIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+# 目录批量模式下识别的图片扩展名
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# 批量模式: 每批最多图片数，以及攒批等待超时（秒）
+OCR_IMAGE_BATCH = 8
+OCR_FLUSH_TIMEOUT = 0.05
+
+# 识别模型对检测框的默认批大小（GPU / CPU）
+RECOG_BATCH_SIZE_GPU = 16
+RECOG_BATCH_SIZE_CPU = 4
+
+# 单张识别时图片最长边超过该值（像素）则先缩小一半再送入 OCR
+OCR_MAX_SIDE = 2000
+
+# 识别结果去重的位置容差（像素）
+DEDUP_TOLERANCE = 30
+
+# 已在GPU上预热过的批次形状 (batch, height, width)
+_WARMED_SHAPES = set()
+
+# 清理文本时删除的字节: 转大写后只保留 A-Z 和 0-9
+_DELETE_BYTES = bytes(b for b in range(256) if chr(b) not in PLATE_ALLOWLIST)
+
+# 预编译的正则表达式
+# 车牌格式: 5-8位字母数字且含数字，并满足
+#   常见格式 2-3个字母开头 + 4-5位字母数字，或
+#   宽松格式 共含2-4个字母
+_PLATE_RE = re.compile(
+    r"(?=[A-Z0-9]{5,8}$)(?=.*[0-9])"
+    r"(?:[A-Z]{2,3}[A-Z0-9]{4,5}|(?:[0-9]*[A-Z]){2,4}[0-9]*)"
+)
+_PLATE_SEARCH_RE = re.compile(r"[A-Z]{2,3}[A-Z0-9]{4,5}")
+
+
+def _clean_text(text: str) -> str:
+    """转大写并只保留字母和数字（bytes.translate 一次完成删除）"""
+    return (
+        text.upper()
+        .encode("ascii", "ignore")
+        .translate(None, _DELETE_BYTES)
+        .decode("ascii")
+    )
+
+
+def get_reader(
+    langs: Tuple[str, ...] = ("en",), gpu: bool = False, cudnn_benchmark: bool = False
+):
+    """
+    获取（或创建并缓存）EasyOCR Reader
+
+    参数:
+        langs: 识别语言列表
+        gpu: 是否使用GPU
+        cudnn_benchmark: 是否开启cuDNN自动调优（输入尺寸固定的批量识别时有效）
+
+    返回:
+        easyocr.Reader 实例
+    """
+    import easyocr
+
+    key = (tuple(langs), gpu, cudnn_benchmark)
+    reader = _READER_CACHE.get(key)
+    if reader is None:
+        reader = easyocr.Reader(
+            list(langs), gpu=gpu, verbose=False, cudnn_benchmark=cudnn_benchmark
+        )
+        _READER_CACHE[key] = reader
+    return reader
+
+
+def cuda_available() -> bool:
+    """检测是否可以使用 CUDA（未安装 torch 时视为不可用）"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def resolve_ocr_options(gpu: bool = None, batch_size: int = None) -> Tuple[bool, int]:
+    """
+    补全 OCR 运行参数
+
+    参数:
+        gpu: 是否使用GPU，None 表示自动检测
+        batch_size: 识别模型批大小，None 表示按 GPU/CPU 取默认值
+
+    返回:
+        (gpu, batch_size)
+    """
+    if gpu is None:
+        gpu = cuda_available()
+    if batch_size is None:
+        batch_size = RECOG_BATCH_SIZE_GPU if gpu else RECOG_BATCH_SIZE_CPU
+    return gpu, batch_size
+
+
 @dataclass
 class PlateInfo:
     """车牌信息"""
@@ -31,78 +141,169 @@ def calculate_grid_positions(plates_data: List[Tuple]) -> List[Tuple[int, int]]:
     返回:
         [(行号, 列号), ...] 列表，从1开始计数
     """
+    import numpy as np
+
     if not plates_data:
         return []
 
     # 提取所有车牌的中心点
-    centers = []
-    for bbox, text, confidence in plates_data:
-        center_x = sum(point[0] for point in bbox) / 4
-        center_y = sum(point[1] for point in bbox) / 4
-        centers.append((center_x, center_y, bbox, text, confidence))
-
-    # 按Y坐标排序，识别行
-    centers_sorted_by_y = sorted(centers, key=lambda c: c[1])
-
-    # 使用聚类方法识别行
-    rows = []
-    current_row = [centers_sorted_by_y[0]]
+    boxes = np.asarray([bbox for bbox, _, _ in plates_data], dtype=np.float64)
+    centers = boxes.sum(axis=1) / 4
+    xs, ys = centers[:, 0], centers[:, 1]
+
+    # 按Y坐标排序，相邻Y差异超过阈值处断开为新的一行
     row_threshold = 50  # Y坐标差异阈值，可以调整
+    order = np.argsort(ys, kind="stable")
+    breaks = np.diff(ys[order]) >= row_threshold
+    row_sorted = np.concatenate(([0], np.cumsum(breaks)))
+    row_id = np.empty(len(order), dtype=np.int64)
+    row_id[order] = row_sorted
 
-    for i in range(1, len(centers_sorted_by_y)):
-        prev_y = centers_sorted_by_y[i - 1][1]
-        curr_y = centers_sorted_by_y[i][1]
+    # 行内按X坐标排序确定列（X相同时保持Y排序的先后）
+    order = np.lexsort((ys, xs, row_id))
+    rows = row_id[order]
+    cols = np.arange(len(order)) - np.searchsorted(rows, rows, side="left")
 
-        if abs(curr_y - prev_y) < row_threshold:
-            # 同一行
-            current_row.append(centers_sorted_by_y[i])
-        else:
-            # 新的一行
-            rows.append(current_row)
-            current_row = [centers_sorted_by_y[i]]
-
-    # 添加最后一行
-    if current_row:
-        rows.append(current_row)
-
-    # 为每行内的车牌按X坐标排序，确定列
-    positions = {}
-    for row_idx, row in enumerate(rows, 1):
-        # 按X坐标排序
-        row_sorted = sorted(row, key=lambda c: c[0])
-        for col_idx, (center_x, center_y, bbox, text, confidence) in enumerate(
-            row_sorted, 1
-        ):
-            # 使用bbox作为key
-            bbox_tuple = tuple(tuple(point) for point in bbox)
-            positions[bbox_tuple] = (row_idx, col_idx)
+    positions = np.empty((len(order), 2), dtype=np.int64)
+    positions[order, 0] = rows + 1
+    positions[order, 1] = cols + 1
 
     # 返回位置列表，按原始顺序
-    result = []
-    for bbox, text, confidence in plates_data:
-        bbox_tuple = tuple(tuple(point) for point in bbox)
-        if bbox_tuple in positions:
-            result.append(positions[bbox_tuple])
+    return [(int(row), int(col)) for row, col in positions]
+
+
+def collect_plates(results: List[Tuple]) -> List[PlateInfo]:
+    """
+    从 EasyOCR 原始结果中筛选车牌：置信度过滤、格式校验、位置去重
+
+    参数:
+        results: [(bbox, text, confidence), ...] 列表
+
+    返回:
+        车牌信息列表
+    """
+    import numpy as np
+
+    print(f"\n识别到 {len(results)} 个文本区域")
+    if not results:
+        return []
+
+    # 一次性计算所有 bbox 的中心点和左上角坐标
+    boxes = np.asarray([bbox for bbox, _, _ in results], dtype=np.float64)
+    centers = (boxes.sum(axis=1) / 4).tolist()
+    top_lefts = boxes.min(axis=1).tolist()
+
+    # 第一步：收集所有可能的车牌，并过滤重复结果
+    plate_dict = {}  # 用于去重，key为位置，value为(结果下标, text, confidence, 接受序号)
+    # 按容差大小划分网格，只需比较相邻 3x3 个网格内的车牌
+    grid = {}  # 网格坐标 -> 该网格内已接受车牌的中心点列表
+    accepted = 0
+
+    for index, (bbox, text, confidence) in enumerate(results):
+        # 过滤置信度低于50%的结果
+        if confidence < 0.5:
+            print(f"DEBUG - 置信度过低({confidence:.2%})，跳过: {text}")
+            continue
+
+        # 清理文本，只保留字母和数字
+        text_clean = _clean_text(text)
+
+        # 快速预筛: 长度不符、纯字母或纯数字的文本不可能是车牌，无需再跑正则
+        maybe_plate = (
+            5 <= len(text_clean) <= 8
+            and not text_clean.isdigit()
+            and not text_clean.isalpha()
+        )
+
+        # 简单的车牌格式验证（text_clean 已清理，直接整体匹配）
+        if maybe_plate and _PLATE_RE.fullmatch(text_clean):
+            # bbox中心点作为唯一标识
+            center_x, center_y = centers[index]
+            cell_x = int(center_x // DEDUP_TOLERANCE)
+            cell_y = int(center_y // DEDUP_TOLERANCE)
+
+            # 检查是否与已有车牌位置重复（容差30像素），多个时取最早接受的
+            existing = None
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for key in grid.get((cell_x + dx, cell_y + dy), ()):
+                        if (
+                            abs(center_x - key[0]) < DEDUP_TOLERANCE
+                            and abs(center_y - key[1]) < DEDUP_TOLERANCE
+                            and (
+                                existing is None
+                                or plate_dict[key][3] < plate_dict[existing][3]
+                            )
+                        ):
+                            existing = key
+
+            is_duplicate = False
+            if existing is not None:
+                # 位置重复，保留置信度更高的
+                if confidence > plate_dict[existing][2]:
+                    del plate_dict[existing]
+                    old_cell = (
+                        int(existing[0] // DEDUP_TOLERANCE),
+                        int(existing[1] // DEDUP_TOLERANCE),
+                    )
+                    grid[old_cell].remove(existing)
+                    print(f"DEBUG - 更新重复位置的车牌: {text_clean} (置信度: {confidence:.2%})")
+                else:
+                    is_duplicate = True
+                    print(f"DEBUG - 跳过重复位置的低置信度结果: {text_clean}")
+
+            if not is_duplicate:
+                key = (center_x, center_y)
+                plate_dict[key] = (index, text_clean, confidence, accepted)
+                grid.setdefault((cell_x, cell_y), []).append(key)
+                accepted += 1
+                print(f"DEBUG - 接受车牌: {text_clean} (置信度: {confidence:.2%})")
         else:
-            result.append((0, 0))  # 未找到位置
+            print(f"DEBUG - 格式不符，跳过: {text_clean}")
+
+    # 第二步：创建PlateInfo对象，使用中心坐标
+    plates = []
+    for index, text_clean, confidence, _ in plate_dict.values():
+        # bounding box 中心坐标
+        center_x, center_y = (int(v) for v in centers[index])
+
+        # 左上角坐标（可选，用于更精确的定位）
+        top_left_x, top_left_y = (int(v) for v in top_lefts[index])
+
+        plate_info = PlateInfo(
+            plate_number=text_clean,
+            bbox=results[index][0],
+            confidence=confidence,
+            center_pos=(center_x, center_y),
+        )
+        plates.append(plate_info)
+        print(
+            f"  - {text_clean:15s} (置信度: {confidence:.2%}, 中心坐标: ({center_x}, {center_y}), 左上角: ({top_left_x}, {top_left_y}))"
+        )
 
-    return result
+    return plates
 
 
-def recognize_plates_from_image(image_path: str) -> List[PlateInfo]:
+def recognize_plates_from_image(
+    image_path: str, gpu: bool = None, batch_size: int = None
+) -> List[PlateInfo]:
     """
     从图片中识别车牌号码及其位置信息
 
     参数:
         image_path: 图片路径
+        gpu: 是否使用GPU，None 表示自动检测
+        batch_size: 识别模型批大小，None 表示按 GPU/CPU 取默认值
 
     返回:
         车牌信息列表
     """
+    if not _HAS_EASYOCR:
+        print("错误: 未安装 easyocr，尝试使用 pytesseract...")
+        return recognize_plates_tesseract(image_path)
+
     try:
-        import easyocr
         import cv2
-        import numpy as np
 
         print(f"正在识别图片: {image_path}")
         print("初始化 EasyOCR...")
@@ -115,95 +316,43 @@ def recognize_plates_from_image(image_path: str) -> List[PlateInfo]:
 
         image_height, image_width = img.shape[:2]
 
-        # 初始化 EasyOCR（只使用英文模型）
-        reader = easyocr.Reader(["en"], gpu=False, verbose=False)
+        # 超大截图缩小一半再识别，检测模型的计算量随像素数下降
+        if max(image_height, image_width) > OCR_MAX_SIDE:
+            img = cv2.resize(
+                img,
+                (image_width // 2, image_height // 2),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        # 初始化 EasyOCR（只使用英文模型，进程内复用）
+        gpu, batch_size = resolve_ocr_options(gpu, batch_size)
+        reader = get_reader(("en",), gpu=gpu, cudnn_benchmark=gpu)
 
-        # 直接识别原始图片 - 使用基础参数
+        # 直接识别已解码的图片，避免 EasyOCR 再次读取并解码文件
         results = reader.readtext(
-            image_path,
+            img,
             detail=1,
             paragraph=False,
-            allowlist="ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
+            allowlist=PLATE_ALLOWLIST,
+            batch_size=batch_size,
         )
 
-        print(f"DEBUG - OCR原始结果数量: {len(results)}")
-
-        # 第一步：收集所有可能的车牌，并过滤重复结果
-        plate_dict = {}  # 用于去重，key为位置，value为(text, confidence)
-        print(f"\n识别到 {len(results)} 个文本区域")
+        if img.shape[:2] != (image_height, image_width):
+            # 将坐标还原到原图
+            scale_x = image_width / img.shape[1]
+            scale_y = image_height / img.shape[0]
+            results = [
+                ([[x * scale_x, y * scale_y] for x, y in bbox], text, confidence)
+                for bbox, text, confidence in results
+            ]
 
-        for bbox, text, confidence in results:
-            # 过滤置信度低于50%的结果
-            if confidence < 0.5:
-                print(f"DEBUG - 置信度过低({confidence:.2%})，跳过: {text}")
-                continue
-
-            # 清理文本
-            text_clean = text.replace(" ", "").replace("\n", "").upper()
-            text_clean = re.sub(r"[^A-Z0-9]", "", text_clean)  # 只保留字母和数字
-
-            # 简单的车牌格式验证
-            if is_likely_plate(text_clean):
-                # 计算bbox中心点作为唯一标识
-                center_x = sum(point[0] for point in bbox) / 4
-                center_y = sum(point[1] for point in bbox) / 4
-
-                # 检查是否与已有车牌位置重复（容差30像素）
-                is_duplicate = False
-                for existing_cx, existing_cy in plate_dict.keys():
-                    if (
-                        abs(center_x - existing_cx) < 30
-                        and abs(center_y - existing_cy) < 30
-                    ):
-                        # 位置重复，保留置信度更高的
-                        if confidence > plate_dict[(existing_cx, existing_cy)][2]:
-                            del plate_dict[(existing_cx, existing_cy)]
-                            print(
-                                f"DEBUG - 更新重复位置的车牌: {text_clean} (置信度: {confidence:.2%})"
-                            )
-                        else:
-                            is_duplicate = True
-                            print(f"DEBUG - 跳过重复位置的低置信度结果: {text_clean}")
-                        break
-
-                if not is_duplicate:
-                    plate_dict[(center_x, center_y)] = (bbox, text_clean, confidence)
-                    print(f"DEBUG - 接受车牌: {text_clean} (置信度: {confidence:.2%})")
-            else:
-                print(f"DEBUG - 格式不符，跳过: {text_clean}")
-
-        # 转换为列表
-        valid_plates = [plate_dict[key] for key in plate_dict]
-
-        # 第二步：创建PlateInfo对象，使用中心坐标
-        if not valid_plates:
-            return []
-
-        plates = []
-        for bbox, text_clean, confidence in valid_plates:
-            # 计算 bounding box 中心坐标
-            center_x = int(sum(point[0] for point in bbox) / 4)
-            center_y = int(sum(point[1] for point in bbox) / 4)
-
-            # 计算左上角坐标（可选，用于更精确的定位）
-            top_left_x = int(min(point[0] for point in bbox))
-            top_left_y = int(min(point[1] for point in bbox))
-
-            plate_info = PlateInfo(
-                plate_number=text_clean,
-                bbox=bbox,
-                confidence=confidence,
-                center_pos=(center_x, center_y),
-            )
-            plates.append(plate_info)
-            print(
-                f"  - {text_clean:15s} (置信度: {confidence:.2%}, 中心坐标: ({center_x}, {center_y}), 左上角: ({top_left_x}, {top_left_y}))"
-            )
+        print(f"DEBUG - OCR原始结果数量: {len(results)}")
 
-        return plates
+        return collect_plates(results)
 
-    except ImportError:
-        print("错误: 未安装 easyocr，尝试使用 pytesseract...")
+    except ImportError as e:
+        # easyocr 已安装但无法导入（如 torch 缺失或损坏），改用 tesseract
+        print(f"错误: 无法加载 easyocr ({e})，尝试使用 pytesseract...")
         return recognize_plates_tesseract(image_path)
     except Exception as e:
         print(f"识别出错: {e}")
@@ -213,12 +362,66 @@ def recognize_plates_from_image(image_path: str) -> List[PlateInfo]:
         return []
 
 
+def _readtext_batch(
+    reader, images: list, gpu: bool = False, batch_size: int = 1
+) -> List[List[Tuple]]:
+    """
+    对一批已解码的图片做一次 readtext_batched 批量识别
+
+    所有图片会被缩放到统一尺寸后组成一个批次送入检测模型，
+    识别结果的坐标再按比例还原到各自原图坐标系。
+
+    参数:
+        reader: easyocr.Reader 实例
+        images: BGR 图片数组列表
+        gpu: 是否使用GPU（决定是否需要预热）
+        batch_size: 识别模型批大小
+
+    返回:
+        与 images 一一对应的 [(bbox, text, confidence), ...] 列表
+    """
+    import numpy as np
+
+    # 统一尺寸，取最大宽高
+    n_height = max(img.shape[0] for img in images)
+    n_width = max(img.shape[1] for img in images)
+
+    shape = (len(images), n_height, n_width)
+    if gpu and shape not in _WARMED_SHAPES:
+        # 预热：让 cuDNN 针对该输入尺寸完成算法选择
+        dummy = np.zeros([*shape, 3], np.uint8)
+        reader.readtext_batched(dummy, n_width=n_width, n_height=n_height)
+        _WARMED_SHAPES.add(shape)
+
+    batch_results = reader.readtext_batched(
+        images,
+        n_width=n_width,
+        n_height=n_height,
+        detail=1,
+        paragraph=False,
+        allowlist=PLATE_ALLOWLIST,
+        batch_size=batch_size,
+    )
+
+    rescaled = []
+    for img, results in zip(images, batch_results):
+        # 将坐标从统一尺寸还原到原图
+        scale_x = img.shape[1] / n_width
+        scale_y = img.shape[0] / n_height
+        rescaled.append(
+            [
+                ([[x * scale_x, y * scale_y] for x, y in bbox], text, confidence)
+                for bbox, text, confidence in results
+            ]
+        )
+    return rescaled
+
+
 def recognize_plates_tesseract(image_path: str) -> List[str]:
     """使用 Tesseract OCR 识别车牌（备用方案）"""
     try:
         import pytesseract
         from PIL import Image
-        import re
 
         print("使用 Tesseract OCR 进行识别...")
 
@@ -227,13 +430,12 @@ def recognize_plates_tesseract(image_path: str) -> List[str]:
         text = pytesseract.image_to_string(img, config=custom_config, lang="eng")
 
         # 使用正则表达式提取车牌模式
-        pattern = r"[A-Z]{2,3}[A-Z0-9]{4,5}"
-        plates = re.findall(pattern, text)
+        plates = _PLATE_SEARCH_RE.findall(text)
 
         plates = list(set(plates))  # 去重
         print(f"识别到 {len(plates)} 个车牌")
-        for plate in plates:
-            print(f"  - {plate}")
+        if plates:
+            print("\n".join(f"  - {plate}" for plate in plates))
 
         return plates
 
@@ -245,47 +447,21 @@ def recognize_plates_tesseract(image_path: str) -> List[str]:
 
 def is_likely_plate(text: str) -> bool:
     """判断文本是否可能是车牌"""
-    import re
+    # 移除非字母数字字符后整体匹配车牌格式
+    return _PLATE_RE.fullmatch(_clean_text(text)) is not None
 
-    # 移除非字母数字字符
-    text = re.sub(r"[^A-Z0-9]", "", text.upper())
 
-    # 长度检查
-    if len(text) < 5 or len(text) > 8:
-        return False
-
-    # 必须包含字母和数字
-    has_letter = any(c.isalpha() for c in text)
-    has_digit = any(c.isdigit() for c in text)
-
-    if not (has_letter and has_digit):
-        return False
-
-    # 匹配常见车牌模式
-    patterns = [
-        r"^[A-Z]{2,3}[A-Z0-9]{4,5}$",
-        r"^[A-Z]{2}[0-9]{4,5}$",
-        r"^[A-Z]{3}[0-9]{4}$",
-    ]
-
-    for pattern in patterns:
-        if re.match(pattern, text):
-            return True
-
-    # 宽松匹配：字母数字混合且格式合理
-    if 2 <= len([c for c in text if c.isalpha()]) <= 4:
-        return True
-
-    return False
-
-
-def analyze_and_score_plates(image_path: str, output_file: str = None):
+def analyze_and_score_plates(
+    image_path: str, output_file: str = None, gpu: bool = None, batch_size: int = None
+):
     """
     分析图片中的车牌并评分排序
 
     参数:
         image_path: 图片路径
         output_file: 可选的输出文件路径
+        gpu: 是否使用GPU，None 表示自动检测
+        batch_size: 识别模型批大小，None 表示按 GPU/CPU 取默认值
     """
     print("=" * 120)
     print("车牌识别与评分系统")
@@ -297,7 +473,7 @@ def analyze_and_score_plates(image_path: str, output_file: str = None):
         return
 
     # 识别车牌
-    plate_infos = recognize_plates_from_image(image_path)
+    plate_infos = recognize_plates_from_image(image_path, gpu, batch_size)
 
     if not plate_infos:
         print("\n未识别到车牌号码")
@@ -309,21 +485,50 @@ def analyze_and_score_plates(image_path: str, output_file: str = None):
     # 创建评分器
     scorer = create_default_scorer()
 
+    score_and_report(image_path, plate_infos, scorer, output_file)
+
+
+def score_and_report(
+    image_path: str,
+    plate_infos: List[PlateInfo],
+    scorer,
+    output_file: str = None,
+    append: bool = False,
+):
+    """
+    对识别出的车牌评分排序并输出报告
+
+    参数:
+        image_path: 图片路径（仅用于报告标题）
+        plate_infos: 车牌信息列表
+        scorer: 评分器
+        output_file: 可选的输出文件路径
+        append: 是否追加写入输出文件（批量处理时使用）
+    """
+    import numpy as np
+
+    # 按列存放车牌字段（SoA），排序和输出时直接按下标取值
+    plate_numbers = [p.plate_number for p in plate_infos]
+    positions = np.array([p.center_pos for p in plate_infos], dtype=np.int64)
+    confidences = np.array([p.confidence for p in plate_infos], dtype=np.float64)
+
     # 评分
-    scored_plates = []
-    for plate_info in plate_infos:
-        total_score, details = scorer.score_plate(plate_info.plate_number)
-        scored_plates.append((plate_info, total_score, details))
+    scored = scorer.score_many(plate_numbers)
+    scores = np.array([total for total, _ in scored], dtype=np.float64)
 
-    # 按分数从高到低排序
-    scored_plates.sort(key=lambda x: x[1], reverse=True)
+    # 按分数从高到低排序（稳定排序，同分保持识别顺序）
+    order = np.argsort(-scores, kind="stable").tolist()
+    sorted_scores = scores[order].tolist()
 
     # 输出结果
     print("\n车牌评分结果（按分数从高到低排序）:")
     print("=" * 120)
 
     output_lines = []
-    for rank, (plate_info, total_score, details) in enumerate(scored_plates, 1):
+    for rank, i in enumerate(order, 1):
+        total_score = sorted_scores[rank - 1]
+        details = scored[i][1]
+
         # 格式化评分报告
         active_rules = [r for r in details if r.score != 0]
         if not active_rules:
@@ -334,56 +539,233 @@ def analyze_and_score_plates(image_path: str, output_file: str = None):
             )
 
         # 添加位置信息和置信度
-        center_x, center_y = plate_info.center_pos
+        center_x, center_y = positions[i].tolist()
         position_str = f"[坐标:({center_x:4d},{center_y:4d})]"
-        confidence_str = f"[置信度:{plate_info.confidence:.2%}]"
+        confidence_str = f"[置信度:{confidences[i].item():.2%}]"
 
-        report = f"{rank:2d}. {plate_info.plate_number:12s} {position_str:18s} {confidence_str:13s} | 总分: {total_score:6.1f} | {rule_summary}"
-        print(report)
+        report = f"{rank:2d}. {plate_numbers[i]:12s} {position_str:18s} {confidence_str:13s} | 总分: {total_score:6.1f} | {rule_summary}"
         output_lines.append(report)
 
+    print("\n".join(output_lines))
+
     # 保存到文件
     if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("车牌评分结果\n")
-            f.write("=" * 120 + "\n")
-            f.write(f"图片: {image_path}\n")
-            f.write(f"识别到 {len(plate_infos)} 个车牌\n")
-            f.write("=" * 120 + "\n\n")
-            for line in output_lines:
-                f.write(line + "\n")
+        with open(output_file, "a" if append else "w", encoding="utf-8") as f:
+            # 拼接成一个字符串后一次写入
+            header = [
+                "车牌评分结果",
+                "=" * 120,
+                f"图片: {image_path}",
+                f"识别到 {len(plate_infos)} 个车牌",
+                "=" * 120,
+                "",
+            ]
+            f.write("".join(line + "\n" for line in header + output_lines))
         print(f"\n结果已保存到: {output_file}")
 
     # 统计信息
     print("\n" + "=" * 120)
     print("评分统计:")
-    print(f"  最高分: {scored_plates[0][1]:.1f} ({scored_plates[0][0].plate_number})")
-    print(f"  最低分: {scored_plates[-1][1]:.1f} ({scored_plates[-1][0].plate_number})")
-    avg_score = sum(s[1] for s in scored_plates) / len(scored_plates)
+    print(f"  最高分: {sorted_scores[0]:.1f} ({plate_numbers[order[0]]})")
+    print(f"  最低分: {sorted_scores[-1]:.1f} ({plate_numbers[order[-1]]})")
+    avg_score = sum(sorted_scores) / len(sorted_scores)
     print(f"  平均分: {avg_score:.1f}")
 
     # 推荐
     print("\n推荐选择:")
-    top_5 = scored_plates[: min(5, len(scored_plates))]
-    for i, (plate_info, score, _) in enumerate(top_5, 1):
-        center_x, center_y = plate_info.center_pos
+    for rank, i in enumerate(order[:5], 1):
+        center_x, center_y = positions[i].tolist()
         print(
-            f"  {i}. {plate_info.plate_number} (分数: {score:.1f}, 中心坐标: ({center_x}, {center_y}), 置信度: {plate_info.confidence:.2%})"
+            f"  {rank}. {plate_numbers[i]} (分数: {sorted_scores[rank - 1]:.1f}, 中心坐标: ({center_x}, {center_y}), 置信度: {confidences[i].item():.2%})"
         )
 
 
+def analyze_and_score_batch(
+    image_paths: List[str],
+    output_file: str = None,
+    gpu: bool = None,
+    batch_size: int = None,
+    image_batch: int = OCR_IMAGE_BATCH,
+):
+    """
+    批量分析多张图片中的车牌并分别评分排序
+
+    处理流程拆分为三个线程阶段，用队列串联，使磁盘读取、OCR 推理与评分输出互相重叠:
+        A. 读取并解码图片
+        B. 攒批（达到 image_batch 张或等待超时）后批量 OCR
+        C. 筛选车牌、评分并输出报告
+
+    参数:
+        image_paths: 图片路径列表
+        output_file: 可选的输出文件路径（所有图片的结果写入同一文件）
+        gpu: 是否使用GPU，None 表示自动检测
+        batch_size: 识别模型批大小，None 表示按 GPU/CPU 取默认值
+        image_batch: 每批 OCR 的最大图片数
+    """
+    print("=" * 120)
+    print("车牌识别与评分系统（批量模式）")
+    print("=" * 120)
+
+    if not _HAS_EASYOCR:
+        print("错误: 未安装 easyocr，批量识别不可用，逐张识别...")
+        for image_path in image_paths:
+            analyze_and_score_plates(image_path, output_file, gpu, batch_size)
+        return
+
+    import cv2
+
+    print("初始化 EasyOCR...")
+    gpu, batch_size = resolve_ocr_options(gpu, batch_size)
+    try:
+        reader = get_reader(("en",), gpu=gpu, cudnn_benchmark=gpu)
+    except ImportError as e:
+        print(f"错误: 无法加载 easyocr ({e})，批量识别不可用，逐张识别...")
+        for image_path in image_paths:
+            analyze_and_score_plates(image_path, output_file, gpu, batch_size)
+        return
+
+    # 评分器只创建一次
+    scorer = create_default_scorer()
+
+    q_io = queue.Queue(maxsize=8)
+    q_ocr = queue.Queue(maxsize=8)
+    errors = []
+    # 任一阶段出错后通知读取/OCR 阶段停止，不再处理剩余图片
+    stop = threading.Event()
+
+    def read_stage():
+        """阶段A: 读取并解码图片"""
+        try:
+            for image_path in image_paths:
+                if stop.is_set():
+                    break
+                if not os.path.exists(image_path):
+                    print(f"错误: 文件不存在 - {image_path}")
+                    continue
+                img = cv2.imread(image_path)
+                if img is None:
+                    print(f"错误: 无法读取图片 {image_path}")
+                    continue
+                q_io.put((image_path, img))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            q_io.put(None)
+
+    def ocr_stage():
+        """阶段B: 攒批后批量 OCR"""
+        pending = []
+        finished = False
+        try:
+            while not finished:
+                try:
+                    item = q_io.get(timeout=OCR_FLUSH_TIMEOUT)
+                except queue.Empty:
+                    item = ()  # 超时：把已攒的图片先送去识别
+
+                if item is None:
+                    finished = True
+                elif item:
+                    if stop.is_set():
+                        continue  # 评分阶段已退出，丢弃剩余图片直到结束标记
+                    pending.append(item)
+                    if len(pending) < image_batch:
+                        continue
+
+                if pending and not stop.is_set():
+                    images = [img for _, img in pending]
+                    batch_results = _readtext_batch(reader, images, gpu, batch_size)
+                    for (image_path, _), results in zip(pending, batch_results):
+                        q_ocr.put((image_path, results))
+                    pending = []
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+            # 继续取走队列直到结束标记，否则读取阶段会阻塞在 put 上无法退出
+            if not finished:
+                while q_io.get() is not None:
+                    pass
+        finally:
+            q_ocr.put(None)
+
+    threads = [
+        threading.Thread(target=read_stage, daemon=True),
+        threading.Thread(target=ocr_stage, daemon=True),
+    ]
+    for t in threads:
+        t.start()
+
+    # 阶段C: 在当前线程筛选、评分、输出，保证打印顺序与图片顺序一致
+    append = False
+    finished = False
+    try:
+        while True:
+            item = q_ocr.get()
+            if item is None:
+                finished = True
+                break
+            image_path, results = item
+
+            print("\n" + "=" * 120)
+            print(f"图片: {image_path}")
+            plate_infos = collect_plates(results)
+            if not plate_infos:
+                print("\n未识别到车牌号码")
+                continue
+
+            print(f"\n成功识别 {len(plate_infos)} 个车牌号码")
+            print("=" * 120)
+            score_and_report(image_path, plate_infos, scorer, output_file, append)
+            append = True
+    finally:
+        # 评分阶段出错退出时让其余阶段停下，并取走队列直到结束标记，
+        # 保证两个线程都能结束，不再持有识别器和已解码的图片
+        stop.set()
+        if not finished:
+            while q_ocr.get() is not None:
+                pass
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+
 def main():
     """主函数"""
-    if len(sys.argv) < 2:
-        print("用法: python analyze_plates.py <图片路径> [输出文件路径]")
-        print("示例: python analyze_plates.py screenshot.jpg result.txt")
-        sys.exit(1)
-
-    image_path = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(
+        description="识别图片中的车牌并评分排序",
+        epilog="示例: python analyze_plates.py screenshot.jpg result.txt\n"
+        "      python analyze_plates.py screenshots/ result.txt",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("image_path", help="图片路径或图片目录")
+    parser.add_argument("output_file", nargs="?", help="输出文件路径")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"识别模型批大小（默认 GPU {RECOG_BATCH_SIZE_GPU} / CPU {RECOG_BATCH_SIZE_CPU}）",
+    )
+    args = parser.parse_args()
+
+    image_path = args.image_path
+    output_file = args.output_file
 
     try:
-        analyze_and_score_plates(image_path, output_file)
+        if os.path.isdir(image_path):
+            image_paths = sorted(
+                os.path.join(image_path, name)
+                for name in os.listdir(image_path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            analyze_and_score_batch(
+                image_paths, output_file, batch_size=args.batch_size
+            )
+        else:
+            analyze_and_score_plates(
+                image_path, output_file, batch_size=args.batch_size
+            )
     except Exception as e:
         print(f"\n发生错误: {e}")
         import traceback
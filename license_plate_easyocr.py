@@ -10,11 +10,39 @@ from PIL import Image
 import re
 
 
+# 常见车牌模式合并为一个预编译正则，只需匹配一次
+#   CDP5747, CDL3034 / CD82694 / CDL3034
+_PLATE_PATTERN_RE = re.compile(
+    r"^(?:[A-Z]{2,3}[A-Z0-9]{4,5}|[A-Z]{2}[0-9]{4,5}|[A-Z]{3}[0-9]{4})$"
+)
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+_PLATE_SEARCH_RE = re.compile(r"[A-Z]{2,3}[A-Z0-9]{4,5}")
+
+
+# EasyOCR Reader 缓存，key为(语言元组, 是否使用GPU)
+_READER_CACHE = {}
+
+
+def get_reader(langs=("ch_sim", "en"), gpu=False):
+    """获取（或创建并缓存）EasyOCR Reader，避免重复加载模型"""
+    key = (tuple(langs), gpu)
+    reader = _READER_CACHE.get(key)
+    if reader is None:
+        reader = easyocr.Reader(list(key[0]), gpu=key[1], verbose=False)
+        _READER_CACHE[key] = reader
+    return reader
+
+
 def recognize_plates_easyocr(image_path, output_path="result_easyocr.jpg"):
-    """使用 EasyOCR 识别车牌"""
+    """
+    使用 EasyOCR 识别车牌
+
+    返回:
+        (车牌列表, OCR原始结果)，原始结果可直接交给 extract_all_plates 复用
+    """
     # 初始化 EasyOCR reader（支持中文和英文）
     print("初始化 EasyOCR (首次运行会下载模型)...")
-    reader = easyocr.Reader(["ch_sim", "en"], gpu=False)
+    reader = get_reader(("ch_sim", "en"), gpu=False)
 
     # 读取图像
     img = cv2.imread(image_path)
@@ -23,9 +51,9 @@ def recognize_plates_easyocr(image_path, output_path="result_easyocr.jpg"):
     print("正在识别图像...")
     results = reader.readtext(image_path)
 
-    # 提取车牌号码
+    # 提取车牌号码；读入的图像只用于标注，直接在其上绘制，不必复制
     license_plates = []
-    result_img = img.copy()
+    result_img = img
 
     print("\n识别到的所有文本:")
     print("=" * 60)
@@ -75,13 +103,13 @@ def recognize_plates_easyocr(image_path, output_path="result_easyocr.jpg"):
 
     print(f"\n标注结果已保存到: {output_path}")
 
-    return license_plates
+    return license_plates, results
 
 
 def is_license_plate(text):
     """判断文本是否为车牌格式"""
     # 移除所有非字母数字字符
-    text = re.sub(r"[^A-Z0-9]", "", text.upper())
+    text = _NON_ALNUM_RE.sub("", text.upper())
 
     # 车牌长度检查（5-7位）
     if len(text) < 5 or len(text) > 8:
@@ -95,24 +123,16 @@ def is_license_plate(text):
         return False
 
     # 匹配常见车牌模式
-    patterns = [
-        r"^[A-Z]{2,3}[A-Z0-9]{4,5}$",  # CDP5747, CDL3034
-        r"^[A-Z]{2}[0-9]{4,5}$",  # CD82694
-        r"^[A-Z]{3}[0-9]{4}$",  # CDL3034
-    ]
-
-    for pattern in patterns:
-        if re.match(pattern, text):
-            return True
+    return _PLATE_PATTERN_RE.match(text) is not None
 
-    return False
 
+def extract_all_plates(results):
+    """
+    从 OCR 结果中提取所有可能的车牌号码
 
-def extract_all_plates(image_path):
-    """提取所有可能的车牌号码"""
-    reader = easyocr.Reader(["ch_sim", "en"], gpu=False)
-    results = reader.readtext(image_path)
-
+    参数:
+        results: reader.readtext 的结果 [(bbox, text, confidence), ...]
+    """
     all_text = []
     for bbox, text, confidence in results:
         text_clean = text.replace(" ", "").upper()
@@ -120,8 +140,7 @@ def extract_all_plates(image_path):
 
     # 使用正则表达式提取车牌模式
     combined_text = " ".join(all_text)
-    pattern = r"[A-Z]{2,3}[A-Z0-9]{4,5}"
-    plates = re.findall(pattern, combined_text)
+    plates = _PLATE_SEARCH_RE.findall(combined_text)
 
     return list(set(plates))
 
@@ -138,12 +157,12 @@ if __name__ == "__main__":
     output_path = sys.argv[2] if len(sys.argv) > 2 else "result_easyocr.jpg"
 
     try:
-        plates = recognize_plates_easyocr(image_path, output_path)
+        plates, results = recognize_plates_easyocr(image_path, output_path)
 
-        # 额外尝试提取所有可能的车牌
+        # 额外尝试提取所有可能的车牌（复用同一次 OCR 结果）
         print("\n" + "=" * 60)
         print("使用模式匹配额外提取:")
-        extra_plates = extract_all_plates(image_path)
+        extra_plates = extract_all_plates(results)
         for plate in extra_plates:
             print(f"  - {plate}")
 
@@ -3,6 +3,13 @@
 使用 OCR 技术识别车辆自助选号系统界面中的车牌选项
 """
 
+import importlib.util
+import os
+import shlex
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from PIL import Image
 import pytesseract
 import cv2
@@ -10,17 +17,49 @@ import numpy as np
 import re
 
 
-def preprocess_image(image_path):
-    """预处理图像以提高 OCR 识别率"""
-    # 读取图像
-    img = cv2.imread(image_path)
+# 车牌号码模式：2-3个字母 + 4-5个数字，或混合组合
+_PLATE_PATTERNS = [
+    re.compile(r"[A-Z]{2,3}[0-9]{4,5}"),  # 如 CDP5747
+    re.compile(r"[A-Z]{3}[0-9]{4}"),  # 如 CDL3034
+    re.compile(r"[A-Z]{2}[A-Z0-9]{5}"),  # 混合模式
+]
 
-    # 转换为灰度图
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+# 对比度增强用的 CLAHE 对象，模块内复用，不必每次预处理都重新创建
+_CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+# 是否安装了 tesserocr（直接调用 libtesseract，可在进程内复用已加载的识别模型）
+_HAS_TESSEROCR = importlib.util.find_spec("tesserocr") is not None
+
+# 每个线程各自持有的 tesserocr 接口，key 为 tesseract 参数字符串
+_TESSEROCR_LOCAL = threading.local()
+
+# 单次 tesseract 子进程调用的超时秒数，超时视为该次识别无结果
+TESSERACT_TIMEOUT = 30
+
+
+def preprocess_image(image_path, keep_color=True):
+    """
+    预处理图像以提高 OCR 识别率
+
+    参数:
+        image_path: 图片路径
+        keep_color: 是否同时返回彩色原图（用于标注识别结果）；
+            为 False 时直接按灰度读取，省去颜色转换，返回的原图为 None
+
+    返回:
+        (彩色原图, 二值图)
+    """
+    if keep_color:
+        # 读取图像并转换为灰度图
+        img = cv2.imread(image_path)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    else:
+        # 不需要标注时直接解码为灰度图
+        img = None
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
 
     # 增强对比度
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(gray)
+    enhanced = _CLAHE.apply(gray)
 
     # 二值化
     _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -29,44 +68,198 @@ def preprocess_image(image_path):
 
 
 def detect_license_plate_regions(image, binary):
-    """检测可能包含车牌号码的区域"""
-    # 查找轮廓
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    """
+    检测可能包含车牌号码的区域
 
-    plate_regions = []
-    height, width = binary.shape
+    返回:
+        (xs, ys, ws, hs) 四个等长的 NumPy 数组，按列存放各区域的外接矩形
+    """
+    # 连通域分析一次返回所有前景块的外接矩形 (x, y, w, h)，按从上到下的顺序排列；
+    # 第0个标签是背景，跳过
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
 
-    for contour in contours:
-        x, y, w, h = cv2.boundingRect(contour)
+    height, width = binary.shape
 
-        # 筛选合适大小的区域（车牌号码区域）
-        aspect_ratio = w / h if h > 0 else 0
-        area = w * h
+    # 取出外接矩形后整体向量化筛选
+    rects = stats[1:, :4].astype(np.int64)
+    w = rects[:, 2]
+    h = rects[:, 3]
+
+    # 筛选合适大小的区域（车牌号码区域）
+    aspect_ratio = w / np.maximum(h, 1)
+    area = w * h
+
+    # 车牌号码区域通常是横向矩形，宽高比约 2-6
+    mask = (
+        (1.5 < aspect_ratio)
+        & (aspect_ratio < 7)
+        & (area > 1000)
+        & (area < width * height * 0.1)
+        & (w > 80)
+        & (h > 20)
+    )
+
+    xs, ys, ws, hs = rects[mask].T
+    return xs, ys, ws, hs
+
+
+def ocr_regions(rois, config, max_workers=None):
+    """
+    批量识别多个区域
+
+    区域按线程数平均分组，每组用一次 tesseract 调用识别；
+    tesseract 在子进程（或不持有 GIL 的 tesserocr）中运行，多个线程可以并行。
+
+    参数:
+        rois: 区域图像列表
+        config: tesseract 参数
+        max_workers: 最大并行数，默认为 CPU 核数
+
+    返回:
+        与 rois 一一对应的识别文本列表
+    """
+    if not rois:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(rois))
+    if workers <= 1:
+        return _ocr_region_group(rois, config)
+
+    # 每个 tesseract 进程只用单线程，避免并行时 CPU 超额占用
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+    size = -(-len(rois) // workers)
+    groups = [rois[i : i + size] for i in range(0, len(rois), size)]
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        results = executor.map(lambda group: _ocr_region_group(group, config), groups)
+    return [text for texts in results for text in texts]
+
+
+def _ocr_region_group(rois, config):
+    """
+    用一次 tesseract 调用识别一组区域
+
+    各区域在内存中合成一个多页 TIFF，经管道交给 tesseract 逐页识别，
+    只需启动一次进程且不落盘；输出按分页符 \f 切分后与区域一一对应。
+    安装了 tesserocr 时改为在进程内逐个识别，不再启动子进程。
+    """
+    if _HAS_TESSEROCR:
+        api = _tesserocr_api(config)
+        texts = []
+        for roi in rois:
+            api.SetImage(Image.fromarray(roi))
+            texts.append(api.GetUTF8Text())
+        return texts
+
+    pages = [Image.fromarray(roi) for roi in rois]
+    buf = BytesIO()
+    pages[0].save(buf, format="TIFF", save_all=True, append_images=pages[1:])
+
+    text = _tesseract_stdin(buf.getvalue(), config)
+
+    pages = text.split("\f")
+    return [pages[i] if i < len(pages) else "" for i in range(len(rois))]
+
+
+def _tesserocr_api(config, lang="eng"):
+    """
+    获取当前线程按 config 初始化好的 tesserocr 接口
+
+    接口首次使用时创建并缓存，之后的识别复用已加载的 traineddata；
+    tesserocr 接口不是线程安全的，因此每个线程各持有一份。
+
+    参数:
+        config: tesseract 命令行参数，支持 --psm、--oem 和 -c 变量=值
+        lang: 识别语言
+
+    返回:
+        tesserocr.PyTessBaseAPI 对象
+    """
+    apis = getattr(_TESSEROCR_LOCAL, "apis", None)
+    if apis is None:
+        apis = _TESSEROCR_LOCAL.apis = {}
+
+    api = apis.get(config)
+    if api is None:
+        # libtesseract 加载时读取 OMP_THREAD_LIMIT，需在导入前设置；
+        # 并行交给外层线程，每个识别只用单线程
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        import tesserocr
+
+        args = shlex.split(config)
+        options = {"psm": tesserocr.PSM.AUTO, "oem": tesserocr.OEM.DEFAULT}
+        variables = []
+        for flag, value in zip(args, args[1:]):
+            if flag in ("--psm", "--oem"):
+                options[flag[2:]] = int(value)
+            elif flag == "-c":
+                variables.append(value.split("=", 1))
+
+        api = tesserocr.PyTessBaseAPI(lang=lang, **options)
+        for name, value in variables:
+            api.SetVariable(name, value)
+        apis[config] = api
+
+    return api
+
+
+def _tesseract_stdin(image_bytes, config, lang="eng", timeout=TESSERACT_TIMEOUT):
+    """
+    通过管道调用 tesseract 识别内存中的图像
+
+    图像从 stdin 传入、文本从 stdout 读回，省去 pytesseract 写临时输入图片
+    和输出文本文件的两次磁盘读写；多页 TIFF 逐页识别，页间以 \f 分隔。
+
+    参数:
+        image_bytes: 编码后的图像数据（PNG、TIFF 等）
+        config: tesseract 参数
+        lang: 识别语言
+        timeout: 超时秒数，超时后终止 tesseract 进程；None 表示不限
+
+    返回:
+        识别文本；超时返回空字符串
+    """
+    cmd = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", lang]
+    cmd += shlex.split(config)
 
-        # 车牌号码区域通常是横向矩形，宽高比约 2-6
-        if (
-            1.5 < aspect_ratio < 7
-            and area > 1000
-            and area < width * height * 0.1
-            and w > 80
-            and h > 20
-        ):
-            plate_regions.append((x, y, w, h))
+    try:
+        proc = subprocess.run(
+            cmd, input=image_bytes, capture_output=True, timeout=timeout
+        )
+    except FileNotFoundError:
+        raise pytesseract.TesseractNotFoundError()
+    except subprocess.TimeoutExpired:
+        return ""
 
-    return plate_regions
+    if proc.returncode:
+        raise pytesseract.TesseractError(
+            proc.returncode, proc.stderr.decode("utf-8", "ignore").strip()
+        )
+    return proc.stdout.decode("utf-8")
 
 
 def extract_license_plates_ocr(image_path):
     """使用 OCR 提取车牌号码"""
-    img, binary = preprocess_image(image_path)
+    _, binary = preprocess_image(image_path, keep_color=False)
+    return ocr_full_image(binary)
+
 
+def ocr_full_image(binary):
+    """对预处理后的整张二值图进行 OCR，返回原始文本"""
     # 配置 tesseract 参数，优化车牌识别
     # --psm 6: 假设单个文本块
     # -c tessedit_char_whitelist: 限制字符集为数字和大写字母
     custom_config = r"--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
-    # 直接对整个图像进行 OCR
-    text = pytesseract.image_to_string(binary, config=custom_config, lang="eng")
+    # 直接对整个图像进行 OCR；安装了 tesserocr 时在进程内识别
+    if _HAS_TESSEROCR:
+        api = _tesserocr_api(custom_config)
+        api.SetImage(Image.fromarray(binary))
+        return api.GetUTF8Text()
+
+    # 否则 PNG 编码后经管道传给 tesseract
+    png_bytes = cv2.imencode(".png", binary)[1].tobytes()
+    text = _tesseract_stdin(png_bytes, custom_config)
 
     return text
 
@@ -74,37 +267,64 @@ def extract_license_plates_ocr(image_path):
 def extract_license_plates_with_regions(image_path):
     """通过区域检测提取车牌号码"""
     img, binary = preprocess_image(image_path)
-    plate_regions = detect_license_plate_regions(img, binary)
+    license_plates, result_img, _ = ocr_plate_regions(img, binary)
+    return license_plates, result_img
+
+
+def ocr_plate_regions(img, binary):
+    """
+    对预处理结果做区域检测 + OCR
+
+    参数:
+        img: 原始彩色图像，识别结果直接标注在该图像上
+        binary: preprocess_image 得到的二值图
+
+    返回:
+        (车牌列表, 标注后的图像, 各区域的原始识别文本)
+    """
+    xs, ys, ws, hs = detect_license_plate_regions(img, binary)
 
     license_plates = []
-    result_img = img.copy()
+    result_img = img
 
     custom_config = r"--oem 3 --psm 7 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
-    for x, y, w, h in plate_regions:
-        # 提取区域
-        roi = binary[y : y + h, x : x + w]
+    # 所有区域一次批量 OCR
+    rois = [
+        binary[ys[i] : ys[i] + hs[i], xs[i] : xs[i] + ws[i]] for i in range(len(xs))
+    ]
+    texts = ocr_regions(rois, custom_config)
 
-        # 对区域进行 OCR
-        text = pytesseract.image_to_string(roi, config=custom_config, lang="eng")
+    # 验证车牌格式（中国车牌格式）
+    valid = []
+    for i, text in enumerate(texts):
         text = text.strip().replace(" ", "").replace("\n", "")
-
-        # 验证车牌格式（中国车牌格式）
         if is_valid_plate(text):
             license_plates.append(text)
-            # 在图像上标记识别结果
-            cv2.rectangle(result_img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            valid.append(i)
+
+    if valid:
+        # 在图像上标记识别结果：所有矩形框一次绘制
+        x0, y0 = xs[valid], ys[valid]
+        x1, y1 = x0 + ws[valid], y0 + hs[valid]
+        corners = np.stack(
+            [np.stack(p, axis=1) for p in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))],
+            axis=1,
+        ).astype(np.int32)
+        cv2.polylines(result_img, list(corners), True, (0, 255, 0), 2)
+
+        for i, text in zip(valid, license_plates):
             cv2.putText(
                 result_img,
                 text,
-                (x, y - 10),
+                (int(xs[i]), int(ys[i]) - 10),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 0.5,
                 (0, 255, 0),
                 2,
             )
 
-    return license_plates, result_img
+    return license_plates, result_img, texts
 
 
 def is_valid_plate(text):
@@ -123,19 +343,11 @@ def is_valid_plate(text):
 
 def parse_plates_with_pattern(text):
     """使用正则表达式匹配车牌号码模式"""
-    # 匹配模式：2-3个字母 + 4-5个数字，或混合组合
-    patterns = [
-        r"[A-Z]{2,3}[0-9]{4,5}",  # 如 CDP5747
-        r"[A-Z]{3}[0-9]{4}",  # 如 CDL3034
-        r"[A-Z]{2}[A-Z0-9]{5}",  # 混合模式
-    ]
-
     plates = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        plates.extend(matches)
+    for pattern in _PLATE_PATTERNS:
+        plates.extend(pattern.findall(text))
 
-    return list(set(plates))  # 去重
+    return list(dict.fromkeys(plates))  # 去重，保持首次出现的顺序
 
 
 def main(image_path, output_path="result.jpg"):
@@ -143,9 +355,20 @@ def main(image_path, output_path="result.jpg"):
     print(f"正在处理图像: {image_path}")
     print("=" * 50)
 
-    # 方法1: 全图 OCR + 正则匹配
-    print("\n方法1: 全图 OCR 识别")
-    text = extract_license_plates_ocr(image_path)
+    # 两种方法共用同一次预处理结果
+    img, binary = preprocess_image(image_path)
+
+    # 区域检测 + OCR，每个候选区域只识别一次
+    plates_region, result_img, region_texts = ocr_plate_regions(img, binary)
+
+    # 方法1: 正则匹配
+    # 优先匹配各区域的识别文本，未检测到候选区域时才对全图做 OCR
+    if region_texts:
+        print("\n方法1: 区域文本正则匹配")
+        text = "\n".join(t.strip() for t in region_texts)
+    else:
+        print("\n方法1: 全图 OCR 识别")
+        text = ocr_full_image(binary)
     print("OCR 识别原始文本:")
     print(text)
     print("\n提取的车牌号码:")
@@ -156,7 +379,6 @@ def main(image_path, output_path="result.jpg"):
     # 方法2: 区域检测 + OCR
     print("\n" + "=" * 50)
     print("方法2: 区域检测识别")
-    plates_region, result_img = extract_license_plates_with_regions(image_path)
     print("识别的车牌号码:")
     for plate in plates_region:
         print(f"  - {plate}")
@@ -6,7 +6,12 @@
 import re
 import json
 import os
+import functools
+import heapq
+import inspect
+import math
 from abc import ABC, abstractmethod
+from collections import Counter
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 
@@ -15,14 +20,442 @@ from dataclasses import dataclass
 class ScoreResult:
     """单个规则的评分结果"""
 
+    # 每个车牌的每条规则都会生成一个实例，用 __slots__ 省去实例字典
+    __slots__ = ("rule_name", "score", "reason")
+
     rule_name: str
     score: float
     reason: str
 
 
+# ASCII 车牌提取数字/字母时要删除的字节，配合 bytes.translate 一次完成
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not chr(b).isdigit() or b > 127)
+_NON_LETTER_BYTES = bytes(b for b in range(256) if not chr(b).isalpha() or b > 127)
+# ASCII 数字字符 -> 数值（'0'->0 ... '9'->9），用于一次换算整串数字
+_DIGIT_VALUE_BYTES = bytes(b - 48 if 48 <= b <= 57 else b for b in range(256))
+
+
+def _extract_digits(plate_number: str) -> str:
+    """提取车牌中的数字部分"""
+    if plate_number.isascii():
+        return (
+            plate_number.encode("ascii")
+            .translate(None, _NON_DIGIT_BYTES)
+            .decode("ascii")
+        )
+    # 含汉字等非 ASCII 字符时按 Unicode 规则逐字符判断
+    return "".join(c for c in plate_number if c.isdigit())
+
+
+def _extract_letters(plate_number: str) -> str:
+    """提取车牌中的字母部分"""
+    if plate_number.isascii():
+        return (
+            plate_number.encode("ascii")
+            .translate(None, _NON_LETTER_BYTES)
+            .decode("ascii")
+        )
+    return "".join(c for c in plate_number if c.isalpha())
+
+
+class PlateContext:
+    """
+    单个车牌的预处理结果，由评分器构建一次后在所有规则间共享
+
+    属性:
+        plate: 原始车牌号码
+        digits: 车牌中的数字
+        letters: 车牌中的字母
+        digit_hist: 长度为10的列表，第 i 项为数字 i 出现的次数
+        digit_counts: 各数字字符出现的次数（Counter，首次访问时计算）
+        digit_ints: 各位数字的整数值（首次访问时计算）
+    """
+
+    __slots__ = (
+        "plate",
+        "digits",
+        "letters",
+        "digit_hist",
+        "_digit_counts",
+        "_digit_ints",
+    )
+
+    def __init__(self, plate_number: str):
+        self.plate = plate_number
+        self.digits = _extract_digits(plate_number)
+        self.letters = _extract_letters(plate_number)
+        # 一次遍历得到各数字的出现次数，比构建 Counter 快得多
+        hist = [0] * 10
+        if self.digits.isascii():
+            for c in self.digits:
+                hist[ord(c) - 48] += 1
+        else:
+            hist = [self.digits.count(c) for c in "0123456789"]
+        self.digit_hist = hist
+        self._digit_counts = None
+        self._digit_ints = None
+
+    @property
+    def digit_counts(self) -> Counter:
+        if self._digit_counts is None:
+            self._digit_counts = Counter(self.digits)
+        return self._digit_counts
+
+    @property
+    def digit_ints(self) -> Tuple[int, ...]:
+        if self._digit_ints is None:
+            if self.digits.isascii():
+                # 按字节换算，不必对每一位调用 int()
+                self._digit_ints = tuple(
+                    self.digits.encode("ascii").translate(_DIGIT_VALUE_BYTES)
+                )
+            else:
+                self._digit_ints = tuple(int(d) for d in self.digits)
+        return self._digit_ints
+
+
+class PlateBatch:
+    """
+    一批车牌的预处理结果，供规则做批量（向量化）评分
+
+    属性:
+        contexts: 每个车牌的 PlateContext
+        digits: (N, W) uint8 数组，每行为一个车牌的数字值(0-9)，不足部分以255填充
+        lengths: (N,) 数组，每个车牌的数字位数
+        non_ascii: 数字含全角等非 ASCII 字符的车牌行号；这些行按无数字打包
+            （lengths 为0），批量结果不可用，需逐个评分
+    """
+
+    PAD = 255
+
+    def __init__(self, plate_numbers: List[str]):
+        import numpy as np
+
+        self.contexts = [PlateContext(p) for p in plate_numbers]
+        rows = []
+        self.non_ascii = []
+        for i, ctx in enumerate(self.contexts):
+            if ctx.digits.isascii():
+                rows.append(ctx.digits.encode("ascii"))
+            else:
+                rows.append(b"")
+                self.non_ascii.append(i)
+        width = max([len(row) for row in rows] + [1])
+        packed = b"".join(row.ljust(width, b"\xff") for row in rows)
+        arr = np.frombuffer(packed, dtype=np.uint8).reshape(-1, width)
+        # 数字字符转为数值，填充位保持255
+        self.digits = np.where(arr == self.PAD, arr, arr - ord("0")).astype(np.uint8)
+        self.lengths = np.array([len(row) for row in rows])
+        # contains 使用的窗口编码，按窗口长度缓存
+        self._windows = {}
+
+    def __len__(self) -> int:
+        return len(self.contexts)
+
+    @property
+    def features(self):
+        """
+        (N, _N_FEATURES) 整数数组，每行为一个车牌的数字特征（见 _F_* 列定义）
+
+        首次访问时计算：安装了 numba 时由编译的内核一次遍历算出，
+        否则用 NumPy 按列整批计算，两者结果相同。
+        """
+        if not hasattr(self, "_features"):
+            kernel = _feature_kernel()
+            if kernel is None:
+                self._features = _numpy_features(self.digits, self.lengths)
+            else:
+                import numpy as np
+
+                self._features = np.zeros((len(self), _N_FEATURES), dtype=np.int64)
+                kernel(self.digits, self.lengths.astype(np.int64), self._features)
+        return self._features
+
+    def contains(self, sequences: List[str]):
+        """
+        判断每个车牌的数字中是否含有给定的数字串（相当于逐个做 seq in digits）
+
+        每种长度的滑动窗口只编码一次（按十进制转为整数），同长度的所有数字串
+        一次 searchsorted 匹配完毕，多条规则的词表可共用已编码的窗口。
+
+        参数:
+            sequences: 数字串列表
+
+        返回:
+            (N, len(sequences)) 布尔数组，第 j 列对应 sequences[j]
+        """
+        import numpy as np
+
+        hits = np.zeros((len(self), len(sequences)), dtype=bool)
+
+        # 按长度分组，重复的数字串只匹配一次；空串总是出现
+        columns: Dict[str, List[int]] = {}
+        for j, seq in enumerate(sequences):
+            if not seq:
+                hits[:, j] = True
+            # 非数字串或比最长车牌还长的串不可能出现
+            elif seq.isascii() and seq.isdigit() and len(seq) <= self.digits.shape[1]:
+                columns.setdefault(seq, []).append(j)
+
+        by_length: Dict[int, List[str]] = {}
+        for seq in columns:
+            by_length.setdefault(len(seq), []).append(seq)
+
+        for length, group in by_length.items():
+            codes = self._window_codes(length)
+            seq_codes = np.array([int(seq) for seq in group], dtype=np.int64)
+            order = np.argsort(seq_codes)
+            sorted_codes = seq_codes[order]
+
+            pos = np.minimum(np.searchsorted(sorted_codes, codes), len(group) - 1)
+            rows, wins = np.nonzero(sorted_codes[pos] == codes)
+            matched = order[pos[rows, wins]]
+            for k, seq in enumerate(group):
+                found = np.zeros(len(self), dtype=bool)
+                found[rows[matched == k]] = True
+                hits[:, columns[seq]] = found[:, None]
+        return hits
+
+    def _window_codes(self, length: int):
+        """
+        (N, W-length+1) 整数数组：各车牌每个长度为 length 的数字窗口按十进制
+        转成的整数，含填充位的窗口为-1；按长度缓存
+        """
+        import numpy as np
+        from numpy.lib.stride_tricks import sliding_window_view
+
+        codes = self._windows.get(length)
+        if codes is None:
+            windows = sliding_window_view(self.digits, length, axis=1)
+            place = 10 ** np.arange(length - 1, -1, -1, dtype=np.int64)
+            codes = windows.astype(np.int64) @ place
+            codes[(windows == self.PAD).any(axis=2)] = -1
+            self._windows[length] = codes
+        return codes
+
+
+# 数字特征列
+_F_COUNT_4 = 0  # 数字4的个数
+_F_COUNT_6 = 1  # 数字6的个数
+_F_COUNT_8 = 2  # 数字8的个数
+_F_PRIMES = 3  # 质数数字(2/3/5/7)的个数
+_F_ALL_EVEN = 4  # 是否全为偶数
+_F_ALL_ODD = 5  # 是否全为奇数
+_F_MAX_REPEAT = 6  # 最长连续重复长度（至少为1）
+_F_MAX_INCREASING = 7  # 最长逐位加1序列长度（至少为1）
+_F_AABB = 8  # AABB片段个数
+_F_ABAB = 9  # ABAB片段个数
+_F_FULL_PALINDROME = 10  # 整体是否为回文
+_F_LONGEST_PALINDROME = 11  # 最长回文子串长度（不足3位为0）
+_N_FEATURES = 12
+
+# 质数数字的位掩码: 第2/3/5/7位为1
+_PRIME_MASK = 0b10101100
+
+
+def _digit_features(digits, lengths, out):
+    """
+    逐行计算数字特征，写入 out
+
+    只使用整数运算和下标访问，供 numba 编译；参数见 PlateBatch.features。
+    """
+    for r in range(digits.shape[0]):
+        d = digits[r]
+        n = lengths[r]
+
+        all_even = 1
+        all_odd = 1
+        max_repeat = cur_repeat = 1
+        max_inc = cur_inc = 1
+        for i in range(n):
+            v = d[i]
+            if v == 4:
+                out[r, _F_COUNT_4] += 1
+            elif v == 6:
+                out[r, _F_COUNT_6] += 1
+            elif v == 8:
+                out[r, _F_COUNT_8] += 1
+            out[r, _F_PRIMES] += (_PRIME_MASK >> v) & 1
+            if v & 1:
+                all_even = 0
+            else:
+                all_odd = 0
+            if i > 0:
+                if v == d[i - 1]:
+                    cur_repeat += 1
+                    if cur_repeat > max_repeat:
+                        max_repeat = cur_repeat
+                else:
+                    cur_repeat = 1
+                if v == d[i - 1] + 1:
+                    cur_inc += 1
+                    if cur_inc > max_inc:
+                        max_inc = cur_inc
+                else:
+                    cur_inc = 1
+            if i + 3 < n:
+                if d[i] == d[i + 1] and d[i + 2] == d[i + 3] and d[i] != d[i + 2]:
+                    out[r, _F_AABB] += 1
+                if d[i] == d[i + 2] and d[i + 1] == d[i + 3] and d[i] != d[i + 1]:
+                    out[r, _F_ABAB] += 1
+
+        full = 1
+        for i in range(n // 2):
+            if d[i] != d[n - 1 - i]:
+                full = 0
+                break
+
+        longest = 0
+        for i in range(n):
+            for j in range(i + 3, n + 1):  # 至少3位
+                if j - i <= longest:
+                    continue
+                is_pal = True
+                for k in range((j - i) // 2):
+                    if d[i + k] != d[j - 1 - k]:
+                        is_pal = False
+                        break
+                if is_pal:
+                    longest = j - i
+
+        out[r, _F_ALL_EVEN] = all_even
+        out[r, _F_ALL_ODD] = all_odd
+        out[r, _F_MAX_REPEAT] = max_repeat
+        out[r, _F_MAX_INCREASING] = max_inc
+        out[r, _F_FULL_PALINDROME] = full
+        out[r, _F_LONGEST_PALINDROME] = longest
+
+
+def _numpy_features(digits, lengths):
+    """
+    _digit_features 的 NumPy 版本，未安装 numba 时使用
+
+    每个特征都是对 (N, W) 数字矩阵的整列运算，不逐个车牌循环；
+    参数见 PlateBatch.features，返回 (N, _N_FEATURES) 整数数组。
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n_rows, width = digits.shape
+    out = np.zeros((n_rows, _N_FEATURES), dtype=np.int64)
+    arr = digits.astype(np.int16)
+    valid = np.arange(width) < lengths[:, None]
+
+    out[:, _F_COUNT_4] = (arr == 4).sum(axis=1)
+    out[:, _F_COUNT_6] = (arr == 6).sum(axis=1)
+    out[:, _F_COUNT_8] = (arr == 8).sum(axis=1)
+    prime_table = np.array([(_PRIME_MASK >> v) & 1 for v in range(256)])
+    out[:, _F_PRIMES] = prime_table[digits].sum(axis=1)
+
+    odd = (arr & 1).astype(bool)
+    out[:, _F_ALL_EVEN] = ~(odd & valid).any(axis=1)
+    out[:, _F_ALL_ODD] = ~(~odd & valid).any(axis=1)
+
+    # 相邻两位都有效时才比较；连续段长度为相邻关系的连续 True 个数加1
+    if width > 1:
+        pair_valid = valid[:, 1:]
+        same = (arr[:, 1:] == arr[:, :-1]) & pair_valid
+        inc = (arr[:, 1:] == arr[:, :-1] + 1) & pair_valid
+        out[:, _F_MAX_REPEAT] = _longest_true_runs(same)[0] + 1
+        out[:, _F_MAX_INCREASING] = _longest_true_runs(inc)[0] + 1
+    else:
+        out[:, _F_MAX_REPEAT] = 1
+        out[:, _F_MAX_INCREASING] = 1
+
+    if width > 3:
+        a, b, c, d = arr[:, :-3], arr[:, 1:-2], arr[:, 2:-1], arr[:, 3:]
+        quad_valid = valid[:, 3:]
+        aabb = (a == b) & (c == d) & (a != c) & quad_valid
+        abab = (a == c) & (b == d) & (a != b) & quad_valid
+        out[:, _F_AABB] = aabb.sum(axis=1)
+        out[:, _F_ABAB] = abab.sum(axis=1)
+
+    # 每位与其对称位置比较，有效位全部相等即为回文
+    mirror = np.clip(lengths[:, None] - 1 - np.arange(width), 0, None)
+    mismatch = (arr != np.take_along_axis(arr, mirror, axis=1)) & valid
+    out[:, _F_FULL_PALINDROME] = ~mismatch.any(axis=1)
+
+    # 由短到长检查每种长度的窗口，最后一次命中的长度即最长回文长度
+    for size in range(3, width + 1):
+        windows = sliding_window_view(arr, size, axis=1)
+        is_pal = (windows == windows[:, :, ::-1]).all(axis=2)
+        fits = np.arange(width - size + 1) + size <= lengths[:, None]
+        hit = (is_pal & fits).any(axis=1)
+        out[hit, _F_LONGEST_PALINDROME] = size
+
+    return out
+
+
+_FEATURE_KERNEL = []
+
+
+def _feature_kernel():
+    """首次使用时用 numba 编译特征内核；未安装 numba 时返回 None"""
+    if not _FEATURE_KERNEL:
+        try:
+            from numba import njit
+        except ImportError:
+            _FEATURE_KERNEL.append(None)
+        else:
+            # 内核不访问 Python 对象，释放 GIL 后多个线程可同时整批评分
+            _FEATURE_KERNEL.append(njit(cache=True, nogil=True)(_digit_features))
+    return _FEATURE_KERNEL[0]
+
+
+def _longest_true_runs(mask):
+    """
+    逐行求最长连续 True 的长度
+
+    参数:
+        mask: (N, M) 布尔数组，M >= 1
+
+    返回:
+        (各行最长长度, 各行首次达到该长度的下标)
+    """
+    import numpy as np
+
+    # 当前下标减去最近一次 False 的下标，即以该位置结尾的连续 True 长度
+    idx = np.arange(mask.shape[1])
+    last_break = np.maximum.accumulate(np.where(mask, -1, idx), axis=1)
+    runs = idx - last_break
+    return runs.max(axis=1), runs.argmax(axis=1)
+
+
+def _accepts_context(method) -> bool:
+    """calculate_score 能否接收第二个位置参数 ctx（旧版规则的签名只有 plate_number）"""
+    params = list(inspect.signature(method).parameters.values())[1:]  # 去掉 self
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+        return True
+    positional = [
+        p
+        for p in params
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    return len(positional) >= 2
+
+
+def _count_bound(max_count: int, unit_score: float, weight: float) -> float:
+    """得分形如 次数*单项分*权重 时的上限（次数在 0..max_count 之间）"""
+    return max(0, max_count * unit_score * weight)
+
+
 class ScoringRule(ABC):
     """评分规则抽象基类"""
 
+    # 车牌数字少于 min_digits 位时规则直接得0分（原因为 few_digits_reason），
+    # 评分器据此跳过调用；子类的 calculate_score 应给出相同结果
+    min_digits = 0
+    few_digits_reason = "数字不足"
+
+    # calculate_score 是否接受 ctx 参数，定义子类时按其签名确定一次；
+    # 按旧版签名 calculate_score(self, plate_number) 编写的规则调用时不传 ctx
+    _accepts_ctx = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._accepts_ctx = _accepts_context(cls.calculate_score)
+
     def __init__(self, name: str, weight: float = 1.0):
         """
         参数:
@@ -31,27 +464,91 @@ class ScoringRule(ABC):
         """
         self.name = name
         self.weight = weight
+        # 0分且原因固定的结果与车牌无关，每条规则只构造一次，各车牌共享
+        self._few_digits = ScoreResult(name, 0, self.few_digits_reason)
 
     @abstractmethod
-    def calculate_score(self, plate_number: str) -> ScoreResult:
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
         """
         计算评分
 
         参数:
             plate_number: 车牌号码
+            ctx: 评分器预先构建的车牌上下文，为None时由规则自行构建
 
         返回:
             ScoreResult: 包含得分和原因的结果
         """
         pass
 
+    def score_with_context(self, plate_number: str, ctx: PlateContext) -> ScoreResult:
+        """调用 calculate_score，旧版只接受 plate_number 的规则不传 ctx"""
+        if self._accepts_ctx:
+            return self.calculate_score(plate_number, ctx)
+        return self.calculate_score(plate_number)
+
+    def get_context(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> PlateContext:
+        """返回共享的车牌上下文，未提供时现场构建"""
+        return ctx if ctx is not None else PlateContext(plate_number)
+
+    def score_value(self, ctx: PlateContext) -> float:
+        """
+        只计算得分（已乘权重），不构造 ScoreResult 和原因文本
+
+        默认直接取 calculate_score 的得分；内置规则覆盖此方法以省去字符串格式化，
+        结果必须与 calculate_score(...).score 完全一致。
+        """
+        return self.score_with_context(ctx.plate, ctx).score
+
+    def max_value(self, ctx: PlateContext) -> float:
+        """
+        score_value 的上限估计，用于 PlateScorer.top_k 的剪枝
+
+        只需保证不小于真实得分，应远比 score_value 便宜。
+        默认返回无穷大（不剪枝），自定义规则无需实现。
+        """
+        return math.inf
+
+    def score_values(self, batch: PlateBatch):
+        """
+        批量计算 score_value，返回与 batch 一一对应的 float64 数组
+
+        优先使用 score_features 的向量化结果，否则逐个调用 score_value。
+        """
+        import numpy as np
+
+        values = self.score_features(batch)
+        if values is None:
+            values = [self.score_value(ctx) for ctx in batch.contexts]
+        return np.asarray(values, dtype=np.float64)
+
+    def score_features(self, batch: PlateBatch):
+        """
+        基于 batch（如 batch.features、batch.contains）向量化计算得分（已乘权重）
+
+        返回 None 表示不支持，由 score_values 逐个计算。
+        """
+        return None
+
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        """
+        批量计算评分，默认逐个调用 calculate_score
+
+        适合向量化的规则可覆盖此方法，直接基于 batch.digits 数组计算。
+        """
+        return [self.score_with_context(ctx.plate, ctx) for ctx in batch.contexts]
+
     def extract_digits(self, plate_number: str) -> str:
         """提取车牌中的数字部分"""
-        return "".join(c for c in plate_number if c.isdigit())
+        return _extract_digits(plate_number)
 
     def extract_letters(self, plate_number: str) -> str:
         """提取车牌中的字母部分"""
-        return "".join(c for c in plate_number if c.isalpha())
+        return _extract_letters(plate_number)
 
 
 class Rule1_NoFour(ScoringRule):
@@ -62,15 +559,14 @@ class Rule1_NoFour(ScoringRule):
         self.no_four_bonus = no_four_bonus
         self.four_penalty_per_count = four_penalty_per_count
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
-        count_4 = digits.count("4")
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        count_4 = self.get_context(plate_number, ctx).digit_hist[4]
 
         if count_4 == 0:
             score = self.no_four_bonus
-            return ScoreResult(
-                self.name, score * self.weight, f"无数字4 (+{score:.0f})"
-            )
+            return ScoreResult(self.name, score * self.weight, f"无数字4 (+{score:.0f})")
         else:
             penalty = count_4 * self.four_penalty_per_count
             return ScoreResult(
@@ -79,44 +575,126 @@ class Rule1_NoFour(ScoringRule):
                 f"含有{count_4}个数字4 (-{penalty:.0f})",
             )
 
+    def score_value(self, ctx: PlateContext) -> float:
+        count_4 = ctx.digit_hist[4]
+        if count_4 == 0:
+            return self.no_four_bonus * self.weight
+        return -(count_4 * self.four_penalty_per_count) * self.weight
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        count_4 = feats[:, _F_COUNT_4]
+        return np.where(
+            count_4 == 0,
+            self.no_four_bonus * self.weight,
+            -(count_4 * self.four_penalty_per_count) * self.weight,
+        )
+
+    def max_value(self, ctx: PlateContext) -> float:
+        n = len(ctx.digits)
+        bound = self.no_four_bonus * self.weight
+        if n:
+            bound = max(
+                bound,
+                -(1 * self.four_penalty_per_count) * self.weight,
+                -(n * self.four_penalty_per_count) * self.weight,
+            )
+        return bound
+
 
 class Rule2_ConsecutiveRepeats(ScoringRule):
     """规则2: 连续重复的数字评分高，重复越多评分越高"""
 
+    min_digits = 1
+    few_digits_reason = "无数字"
+
     def __init__(self, repeat_base_score: float = 15):
         super().__init__("连续重复数字", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无连续重复")
         self.repeat_base_score = repeat_base_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
+
+        if len(digits) < self.min_digits:
+            return self._few_digits
+
+        return self._result(*self._longest_repeat(digits))
 
-        if not digits:
-            return ScoreResult(self.name, 0, "无数字")
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        import numpy as np
 
+        arr = batch.digits
+        if arr.shape[1] < 2:
+            runs = np.zeros(len(batch), dtype=np.int64)
+            ends = runs
+        else:
+            # 相邻两位相同（排除填充位之间的相等）
+            same = (arr[:, 1:] == arr[:, :-1]) & (arr[:, 1:] != PlateBatch.PAD)
+            runs, ends = _longest_true_runs(same)
+
+        return [
+            self._result(int(run) + 1, str(arr[i, end + 1]) if run else "")
+            if length
+            else self._few_digits
+            for i, (run, end, length) in enumerate(zip(runs, ends, batch.lengths))
+        ]
+
+    def _result(self, max_repeat: int, repeat_digit: str) -> ScoreResult:
+        if max_repeat >= 2:
+            score = (max_repeat - 1) * self.repeat_base_score  # 2连得base分，3连得2*base分
+            return ScoreResult(
+                self.name,
+                score * self.weight,
+                f"连续{max_repeat}个{repeat_digit} (+{score:.0f})",
+            )
+        else:
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        max_repeat, _ = self._longest_repeat(ctx.digits)
+        if max_repeat >= 2:
+            return (max_repeat - 1) * self.repeat_base_score * self.weight
+        return 0
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        max_repeat = feats[:, _F_MAX_REPEAT]
+        return np.where(
+            max_repeat >= 2,
+            (max_repeat - 1) * self.repeat_base_score * self.weight,
+            0,
+        )
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(len(ctx.digits) - 1, self.repeat_base_score, self.weight)
+
+    @staticmethod
+    def _longest_repeat(digits: str) -> Tuple[int, str]:
+        """最长连续重复的长度及重复的数字"""
         max_repeat = 1
         current_repeat = 1
         repeat_digit = ""
 
-        for i in range(1, len(digits)):
-            if digits[i] == digits[i - 1]:
+        # 直接遍历字符并记住上一个，省去每步两次下标取值
+        prev = None
+        for c in digits:
+            if c == prev:
                 current_repeat += 1
                 if current_repeat > max_repeat:
                     max_repeat = current_repeat
-                    repeat_digit = digits[i]
+                    repeat_digit = c
             else:
                 current_repeat = 1
+                prev = c
 
-        if max_repeat >= 2:
-            score = (
-                max_repeat - 1
-            ) * self.repeat_base_score  # 2连得base分，3连得2*base分
-            return ScoreResult(
-                self.name,
-                score * self.weight,
-                f"连续{max_repeat}个{repeat_digit} (+{score:.0f})",
-            )
-        else:
-            return ScoreResult(self.name, 0, "无连续重复")
+        return max_repeat, repeat_digit
 
 
 class Rule3_Lucky68(ScoringRule):
@@ -124,17 +702,20 @@ class Rule3_Lucky68(ScoringRule):
 
     def __init__(self, lucky_digit_score: float = 8):
         super().__init__("吉祥数字6/8", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无6或8")
         self.lucky_digit_score = lucky_digit_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
-        count_6 = digits.count("6")
-        count_8 = digits.count("8")
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digit_hist = self.get_context(plate_number, ctx).digit_hist
+        count_6 = digit_hist[6]
+        count_8 = digit_hist[8]
 
         total_count = count_6 + count_8
 
         if total_count == 0:
-            return ScoreResult(self.name, 0, "无6或8")
+            return self._no_match
         else:
             score = total_count * self.lucky_digit_score
             details = []
@@ -148,62 +729,123 @@ class Rule3_Lucky68(ScoringRule):
                 f"含有{', '.join(details)} (+{score:.0f})",
             )
 
+    def score_value(self, ctx: PlateContext) -> float:
+        total_count = ctx.digit_hist[6] + ctx.digit_hist[8]
+        return total_count * self.lucky_digit_score * self.weight
+
+    def score_features(self, batch: PlateBatch):
+        feats = batch.features
+        total_count = feats[:, _F_COUNT_6] + feats[:, _F_COUNT_8]
+        return total_count * self.lucky_digit_score * self.weight
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(len(ctx.digits), self.lucky_digit_score, self.weight)
+
 
 class Rule4_IncreasingSequence(ScoringRule):
     """规则4: 递增序列评分高"""
 
+    min_digits = 2
+
     def __init__(self, sequence_base_score: float = 20):
         super().__init__("递增序列", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无明显递增序列")
         self.sequence_base_score = sequence_base_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
 
-        if len(digits) < 2:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(ctx.digits) < self.min_digits:
+            return self._few_digits
 
-        max_sequence = 1
-        current_sequence = 1
+        return self._result(self._longest_increasing(ctx.digit_ints))
 
-        for i in range(1, len(digits)):
-            if int(digits[i]) == int(digits[i - 1]) + 1:
-                current_sequence += 1
-                max_sequence = max(max_sequence, current_sequence)
-            else:
-                current_sequence = 1
+    def calculate_many(self, batch: PlateBatch) -> List[ScoreResult]:
+        import numpy as np
+
+        arr = batch.digits.astype(np.int16)
+        if arr.shape[1] < 2:
+            return [self._few_digits] * len(batch.contexts)
 
+        # 相邻差为1即递增一步；填充位255不会与任何数字构成+1
+        runs, _ = _longest_true_runs(np.diff(arr, axis=1) == 1)
+
+        return [
+            self._result(int(run) + 1) if length >= 2 else self._few_digits
+            for run, length in zip(runs, batch.lengths)
+        ]
+
+    def _result(self, max_sequence: int) -> ScoreResult:
         if max_sequence >= 3:
-            score = (
-                max_sequence - 2
-            ) * self.sequence_base_score  # 3连得base分，4连得2*base分
+            score = (max_sequence - 2) * self.sequence_base_score  # 3连得base分，4连得2*base分
             return ScoreResult(
                 self.name,
                 score * self.weight,
                 f"{max_sequence}位递增序列 (+{score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "无明显递增序列")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        max_sequence = self._longest_increasing(ctx.digit_ints)
+        if max_sequence >= 3:
+            return (max_sequence - 2) * self.sequence_base_score * self.weight
+        return 0
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        max_sequence = feats[:, _F_MAX_INCREASING]
+        return np.where(
+            max_sequence >= 3,
+            (max_sequence - 2) * self.sequence_base_score * self.weight,
+            0,
+        )
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(len(ctx.digits) - 2, self.sequence_base_score, self.weight)
+
+    @staticmethod
+    def _longest_increasing(digit_ints: Tuple[int, ...]) -> int:
+        """最长的逐位加1连续序列长度"""
+        max_sequence = 1
+        current_sequence = 1
+
+        for i in range(1, len(digit_ints)):
+            if digit_ints[i] == digit_ints[i - 1] + 1:
+                current_sequence += 1
+                max_sequence = max(max_sequence, current_sequence)
+            else:
+                current_sequence = 1
+
+        return max_sequence
 
 
 class Rule5_AllEvenOrOdd(ScoringRule):
     """规则5: 全是偶数或者全是奇数评分高"""
 
+    min_digits = 3
+
     def __init__(self, all_even_odd_score: float = 25):
         super().__init__("全偶数或全奇数", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "奇偶混合")
         self.all_even_odd_score = all_even_odd_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
+        digits = ctx.digits
 
-        if len(digits) < 3:
-            return ScoreResult(self.name, 0, "数字不足")
-
-        digit_nums = [int(d) for d in digits]
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
-        all_even = all(d % 2 == 0 for d in digit_nums)
-        all_odd = all(d % 2 == 1 for d in digit_nums)
+        any_odd, all_odd = self._parities(digits)
 
-        if all_even:
+        if not any_odd:
             score = self.all_even_odd_score
             return ScoreResult(
                 self.name,
@@ -218,28 +860,69 @@ class Rule5_AllEvenOrOdd(ScoringRule):
                 f"全部{len(digits)}位为奇数 (+{score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "奇偶混合")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        if len(ctx.digits) < 3:
+            return 0
+        any_odd, all_odd = self._parities(ctx.digits)
+        if not any_odd or all_odd:
+            return self.all_even_odd_score * self.weight
+        return 0
+
+    @staticmethod
+    def _parities(digits: str) -> Tuple[int, int]:
+        """
+        一次遍历求各位奇偶性的按位或与按位与
+
+        数字字符的 ASCII 码与数字本身奇偶性相同，直接取最低位即可。
+
+        返回:
+            (按位或, 按位与)：前者为0表示全偶数，后者为1表示全奇数
+        """
+        any_odd, all_odd = 0, 1
+        for c in digits:
+            bit = ord(c) & 1
+            any_odd |= bit
+            all_odd &= bit
+        return any_odd, all_odd
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        hit = (batch.lengths >= 3) & (
+            (feats[:, _F_ALL_EVEN] == 1) | (feats[:, _F_ALL_ODD] == 1)
+        )
+        return np.where(hit, self.all_even_odd_score * self.weight, 0)
+
+    def max_value(self, ctx: PlateContext) -> float:
+        if len(ctx.digits) < 3:
+            return 0
+        return max(0, self.all_even_odd_score * self.weight)
 
 
 class Rule6_AllPrimes(ScoringRule):
     """规则6: 全是质数评分高"""
 
+    min_digits = 3
+
     def __init__(self, all_prime_score: float = 30, mostly_prime_score: float = 10):
         super().__init__("全质数", weight=1.0)
         self.all_prime_score = all_prime_score
         self.mostly_prime_score = mostly_prime_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
-
-        if len(digits) < 3:
-            return ScoreResult(self.name, 0, "数字不足")
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        ctx = self.get_context(plate_number, ctx)
+        digits = ctx.digits
 
-        primes = {"2", "3", "5", "7"}
-        digit_list = list(digits)
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
-        prime_count = sum(1 for d in digit_list if d in primes)
-        all_prime = all(d in primes for d in digit_list)
+        prime_count = self._prime_count(ctx)
+        all_prime = prime_count == len(digits)
 
         if all_prime:
             score = self.all_prime_score
@@ -258,22 +941,70 @@ class Rule6_AllPrimes(ScoringRule):
         else:
             return ScoreResult(self.name, 0, f"仅{prime_count}位质数")
 
+    def score_value(self, ctx: PlateContext) -> float:
+        digits = ctx.digits
+        if len(digits) < 3:
+            return 0
+        prime_count = self._prime_count(ctx)
+        if prime_count == len(digits):
+            return self.all_prime_score * self.weight
+        elif prime_count >= len(digits) * 0.6:
+            return self.mostly_prime_score * self.weight
+        return 0
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        lengths = batch.lengths
+        prime_count = feats[:, _F_PRIMES]
+        return np.select(
+            [lengths < 3, prime_count == lengths, prime_count >= lengths * 0.6],
+            [
+                0,
+                self.all_prime_score * self.weight,
+                self.mostly_prime_score * self.weight,
+            ],
+            0,
+        )
+
+    def max_value(self, ctx: PlateContext) -> float:
+        if len(ctx.digits) < 3:
+            return 0
+        return max(
+            0,
+            self.all_prime_score * self.weight,
+            self.mostly_prime_score * self.weight,
+        )
+
+    @staticmethod
+    def _prime_count(ctx: PlateContext) -> int:
+        """质数数字(2/3/5/7)的个数"""
+        hist = ctx.digit_hist
+        return hist[2] + hist[3] + hist[5] + hist[7]
+
+
+# 特殊字母位掩码: 第 ord(c) 位为1表示 c 为特殊字母
+_SPECIAL_LETTER_MASK = sum(1 << ord(c) for c in "MJTQ")
+
 
 class Rule7_SpecialLetters(ScoringRule):
     """规则7: 含有MJTQ这几个字母的评分高"""
 
     def __init__(self, special_letter_score: float = 12):
         super().__init__("特殊字母MJTQ", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无特殊字母")
         self.special_letter_score = special_letter_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        letters = self.extract_letters(plate_number).upper()
-        special_letters = set("MJTQ")
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        letters = self.get_context(plate_number, ctx).letters.upper()
 
-        found_letters = [l for l in letters if l in special_letters]
+        found_letters = [l for l in letters if (_SPECIAL_LETTER_MASK >> ord(l)) & 1]
 
         if not found_letters:
-            return ScoreResult(self.name, 0, "无特殊字母")
+            return self._no_match
         else:
             score = len(found_letters) * self.special_letter_score
             return ScoreResult(
@@ -282,21 +1013,37 @@ class Rule7_SpecialLetters(ScoringRule):
                 f"含有字母{', '.join(found_letters)} (+{score:.0f})",
             )
 
+    def score_value(self, ctx: PlateContext) -> float:
+        letters = ctx.letters.upper()
+        found_count = sum((_SPECIAL_LETTER_MASK >> ord(l)) & 1 for l in letters)
+        return found_count * self.special_letter_score * self.weight
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(
+            len(ctx.letters.upper()), self.special_letter_score, self.weight
+        )
+
 
 class Rule8_LuckySequences(ScoringRule):
     """规则8: 幸运连号（12, 312, 0312, 0228, 228, 28）"""
 
+    min_digits = 1
+    few_digits_reason = "无数字"
+
     def __init__(self, lucky_sequence_score: float = 30):
         super().__init__("幸运连号", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无幸运连号")
         self.lucky_sequence_score = lucky_sequence_score
         # 定义幸运连号列表，按长度从长到短排序（优先匹配长的）
         self.lucky_sequences = ["0312", "0228", "312", "228", "28"]
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if not digits:
-            return ScoreResult(self.name, 0, "无数字")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         # 查找所有匹配的幸运连号
         found_sequences = []
@@ -305,7 +1052,7 @@ class Rule8_LuckySequences(ScoringRule):
                 found_sequences.append(seq)
 
         if not found_sequences:
-            return ScoreResult(self.name, 0, "无幸运连号")
+            return self._no_match
         else:
             # 每个幸运连号得分
             score = len(found_sequences) * self.lucky_sequence_score
@@ -316,12 +1063,33 @@ class Rule8_LuckySequences(ScoringRule):
                 f"含有幸运连号: {seq_str} (+{score:.0f})",
             )
 
+    def score_value(self, ctx: PlateContext) -> float:
+        digits = ctx.digits
+        # 连号只有几个且车牌很短，逐个 in 判断比正则/生成器更快
+        found_count = 0
+        for seq in self.lucky_sequences:
+            if seq in digits:
+                found_count += 1
+        return found_count * self.lucky_sequence_score * self.weight
+
+    def score_features(self, batch: PlateBatch):
+        found_count = batch.contains(self.lucky_sequences).sum(axis=1)
+        return found_count * self.lucky_sequence_score * self.weight
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(
+            len(self.lucky_sequences), self.lucky_sequence_score, self.weight
+        )
+
 
 class Rule9_Pronunciation(ScoringRule):
     """规则9: 读起来顺口的评分高"""
 
+    min_digits = 3
+
     def __init__(self, smooth_phrase_score: float = 25, tone_variety_score: float = 10):
         super().__init__("读音顺口", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无顺口组合")
         self.smooth_phrase_score = smooth_phrase_score
         self.tone_variety_score = tone_variety_score
 
@@ -338,6 +1106,9 @@ class Rule9_Pronunciation(ScoringRule):
             "8": 1,  # 八 bā
             "9": 3,  # 九 jiǔ
         }
+        # 字符 -> 音调的字节查找表，供 bytes.translate 一次查出整串音调
+        # （修改 digit_tones 后需重建）
+        self._tone_table = bytes(self.digit_tones.get(chr(b), 0) for b in range(256))
 
         # 常见的顺口谐音组合（吉利寓意）
         self.smooth_phrases = {
@@ -362,40 +1133,32 @@ class Rule9_Pronunciation(ScoringRule):
             "688": "路发发",
             "588": "我发发",
         }
+        # 所有组合合成一个正则：绝大多数车牌不含任何组合，一次 search 即可跳过
+        # 逐个查找（修改 smooth_phrases 后需重新编译）
+        self._phrase_re = re.compile("|".join(map(re.escape, self.smooth_phrases)))
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if len(digits) < 3:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         total_score = 0
         reasons = []
 
         # 1. 检查是否包含顺口谐音组合
-        for phrase, meaning in self.smooth_phrases.items():
-            if phrase in digits:
-                total_score += self.smooth_phrase_score
-                reasons.append(f"含'{phrase}'({meaning})")
+        if self._phrase_re.search(digits):
+            for phrase, meaning in self.smooth_phrases.items():
+                if phrase in digits:
+                    total_score += self.smooth_phrase_score
+                    reasons.append(f"含'{phrase}'({meaning})")
 
         # 2. 检查音调变化（抑扬顿挫更顺口）
-        if len(digits) >= 3:
-            tones = [self.digit_tones.get(d, 0) for d in digits]
-
-            # 计算音调多样性
-            unique_tones = len(set(tones))
-
-            # 检查是否有音调变化（避免单调）
-            has_tone_change = False
-            for i in range(1, len(tones)):
-                if abs(tones[i] - tones[i - 1]) >= 2:  # 音调差异较大
-                    has_tone_change = True
-                    break
-
-            # 音调丰富度评分
-            if unique_tones >= 3 and has_tone_change:
-                total_score += self.tone_variety_score
-                reasons.append("音调抑扬顿挫")
+        if self._has_tone_variety(digits):
+            total_score += self.tone_variety_score
+            reasons.append("音调抑扬顿挫")
 
         if total_score > 0:
             reason_str = ", ".join(reasons)
@@ -405,32 +1168,119 @@ class Rule9_Pronunciation(ScoringRule):
                 f"{reason_str} (+{total_score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "无顺口组合")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        digits = ctx.digits
+        if len(digits) < 3:
+            return 0
+
+        total_score = 0
+        if self._phrase_re.search(digits):
+            for phrase in self.smooth_phrases:
+                if phrase in digits:
+                    total_score += self.smooth_phrase_score
+        if self._has_tone_variety(digits):
+            total_score += self.tone_variety_score
+
+        if total_score > 0:
+            return total_score * self.weight
+        return 0
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        found = batch.contains(list(self.smooth_phrases))
+        has_tone_variety = self._tone_variety_many(batch)
+
+        # 按与 score_value 相同的顺序逐项累加，保证浮点结果一致
+        found_count = found.sum(axis=1)
+        total_score = np.zeros(len(batch))
+        for i in range(found.shape[1]):
+            total_score = np.where(
+                found_count > i, total_score + self.smooth_phrase_score, total_score
+            )
+        total_score = np.where(
+            has_tone_variety, total_score + self.tone_variety_score, total_score
+        )
+
+        hit = (batch.lengths >= 3) & (total_score > 0)
+        return np.where(hit, total_score * self.weight, 0)
+
+    def max_value(self, ctx: PlateContext) -> float:
+        if len(ctx.digits) < 3 or self.weight <= 0:
+            return 0
+        # 按与 score_value 相同的顺序累加所有正分项
+        total_score = 0
+        if self.smooth_phrase_score > 0:
+            for _ in self.smooth_phrases:
+                total_score += self.smooth_phrase_score
+        if self.tone_variety_score > 0:
+            total_score += self.tone_variety_score
+        return total_score * self.weight
+
+    def _has_tone_variety(self, digits: str) -> bool:
+        """音调丰富（至少3种）且相邻数字有明显起伏"""
+        if len(digits) < 3:
+            return False
+
+        if digits.isascii():
+            # 查表一次得到各位音调，逐个取出即为整数
+            tones = digits.encode("ascii").translate(self._tone_table)
+        else:
+            tones = [self.digit_tones.get(d, 0) for d in digits]
+
+        # 计算音调多样性
+        if len(set(tones)) < 3:
+            return False
+
+        # 检查是否有音调变化（避免单调）
+        prev_tone = tones[0]
+        for tone in tones:
+            if abs(tone - prev_tone) >= 2:  # 音调差异较大
+                return True
+            prev_tone = tone
+        return False
+
+    def _tone_variety_many(self, batch: PlateBatch):
+        """_has_tone_variety 的批量版本，返回 (N,) 布尔数组"""
+        import numpy as np
+
+        # 数字值 -> 音调的查找表，未定义音调的数字为0
+        tone_table = np.zeros(256, dtype=np.int64)
+        for d in "0123456789":
+            tone_table[int(d)] = self.digit_tones.get(d, 0)
+        tones = tone_table[batch.digits]
+        valid = np.arange(batch.digits.shape[1]) < batch.lengths[:, None]
+
+        unique_tones = np.zeros(len(batch), dtype=np.int64)
+        for tone in set(tone_table[:10].tolist()):
+            unique_tones += ((tones == tone) & valid).any(axis=1)
+
+        big_change = (np.abs(np.diff(tones, axis=1)) >= 2) & valid[:, 1:]
+        return (batch.lengths >= 3) & (unique_tones >= 3) & big_change.any(axis=1)
 
 
 class Rule10_PatternAABB(ScoringRule):
     """规则10: AABB模式 (如1122、5566)"""
 
+    min_digits = 4
+
     def __init__(self, aabb_score: float = 20):
         super().__init__("AABB模式", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无AABB模式")
         self.aabb_score = aabb_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if len(digits) < 4:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         # 查找AABB模式
-        aabb_patterns = []
-        for i in range(len(digits) - 3):
-            if (
-                digits[i] == digits[i + 1]
-                and digits[i + 2] == digits[i + 3]
-                and digits[i] != digits[i + 2]
-            ):
-                pattern = digits[i : i + 4]
-                aabb_patterns.append(pattern)
+        aabb_patterns = self._find_aabb(digits)
 
         if aabb_patterns:
             score = len(aabb_patterns) * self.aabb_score
@@ -441,21 +1291,49 @@ class Rule10_PatternAABB(ScoringRule):
                 f"含AABB模式: {patterns_str} (+{score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "无AABB模式")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        return len(self._find_aabb(ctx.digits)) * self.aabb_score * self.weight
+
+    def score_features(self, batch: PlateBatch):
+        feats = batch.features
+        return feats[:, _F_AABB] * self.aabb_score * self.weight
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(len(ctx.digits) - 3, self.aabb_score, self.weight)
+
+    @staticmethod
+    def _find_aabb(digits: str) -> List[str]:
+        """按出现顺序返回所有AABB片段"""
+        aabb_patterns = []
+        for i in range(len(digits) - 3):
+            if (
+                digits[i] == digits[i + 1]
+                and digits[i + 2] == digits[i + 3]
+                and digits[i] != digits[i + 2]
+            ):
+                aabb_patterns.append(digits[i : i + 4])
+        return aabb_patterns
 
 
 class Rule11_Palindrome(ScoringRule):
     """规则11: 回文数字 (如121、1221、12321)"""
 
+    min_digits = 3
+
     def __init__(self, palindrome_base_score: float = 15):
         super().__init__("回文数字", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无回文数")
         self.palindrome_base_score = palindrome_base_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if len(digits) < 3:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         # 检查整体是否为回文
         if digits == digits[::-1]:
@@ -465,16 +1343,8 @@ class Rule11_Palindrome(ScoringRule):
             )
 
         # 查找最长的回文子串
-        max_palindrome_len = 0
-        max_palindrome = ""
-
-        for i in range(len(digits)):
-            for j in range(i + 3, len(digits) + 1):  # 至少3位
-                substring = digits[i:j]
-                if substring == substring[::-1]:
-                    if len(substring) > max_palindrome_len:
-                        max_palindrome_len = len(substring)
-                        max_palindrome = substring
+        max_palindrome = self._longest_palindrome(digits)
+        max_palindrome_len = len(max_palindrome)
 
         if max_palindrome_len >= 3:
             score = max_palindrome_len * self.palindrome_base_score
@@ -484,32 +1354,83 @@ class Rule11_Palindrome(ScoringRule):
                 f"含回文数: {max_palindrome} (+{score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "无回文数")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        digits = ctx.digits
+        if len(digits) < 3:
+            return 0
+        if digits == digits[::-1]:
+            return len(digits) * self.palindrome_base_score * self.weight
+        max_palindrome_len = len(self._longest_palindrome(digits))
+        if max_palindrome_len >= 3:
+            return max_palindrome_len * self.palindrome_base_score * self.weight
+        return 0
+
+    def score_features(self, batch: PlateBatch):
+        import numpy as np
+
+        feats = batch.features
+        lengths = batch.lengths
+        longest = feats[:, _F_LONGEST_PALINDROME]
+        return np.select(
+            [
+                lengths < 3,
+                feats[:, _F_FULL_PALINDROME] == 1,
+                longest >= 3,
+            ],
+            [
+                0,
+                lengths * self.palindrome_base_score * self.weight,
+                longest * self.palindrome_base_score * self.weight,
+            ],
+            0,
+        )
+
+    def max_value(self, ctx: PlateContext) -> float:
+        if len(ctx.digits) < 3:
+            return 0
+        return _count_bound(len(ctx.digits), self.palindrome_base_score, self.weight)
+
+    @staticmethod
+    def _longest_palindrome(digits: str) -> str:
+        """最左最长的回文子串（至少3位），没有则返回空串"""
+        # 从长到短、从左到右检查每个窗口，首个命中即为最左最长的回文；
+        # 窗口用首尾两个下标向中间比较，不切片，不匹配时通常第一对就失败
+        n = len(digits)
+
+        for length in range(n, 2, -1):
+            for start in range(n - length + 1):
+                lo, hi = start, start + length - 1
+                while lo < hi and digits[lo] == digits[hi]:
+                    lo += 1
+                    hi -= 1
+                if lo >= hi:
+                    return digits[start : start + length]
+
+        return ""
 
 
 class Rule12_PatternABAB(ScoringRule):
     """规则12: ABAB模式 (如1212、3434)"""
 
+    min_digits = 4
+
     def __init__(self, abab_score: float = 20):
         super().__init__("ABAB模式", weight=1.0)
+        self._no_match = ScoreResult(self.name, 0, "无ABAB模式")
         self.abab_score = abab_score
 
-    def calculate_score(self, plate_number: str) -> ScoreResult:
-        digits = self.extract_digits(plate_number)
+    def calculate_score(
+        self, plate_number: str, ctx: Optional[PlateContext] = None
+    ) -> ScoreResult:
+        digits = self.get_context(plate_number, ctx).digits
 
-        if len(digits) < 4:
-            return ScoreResult(self.name, 0, "数字不足")
+        if len(digits) < self.min_digits:
+            return self._few_digits
 
         # 查找ABAB模式
-        abab_patterns = []
-        for i in range(len(digits) - 3):
-            if (
-                digits[i] == digits[i + 2]
-                and digits[i + 1] == digits[i + 3]
-                and digits[i] != digits[i + 1]
-            ):
-                pattern = digits[i : i + 4]
-                abab_patterns.append(pattern)
+        abab_patterns = self._find_abab(digits)
 
         if abab_patterns:
             score = len(abab_patterns) * self.abab_score
@@ -520,43 +1441,242 @@ class Rule12_PatternABAB(ScoringRule):
                 f"含ABAB模式: {patterns_str} (+{score:.0f})",
             )
         else:
-            return ScoreResult(self.name, 0, "无ABAB模式")
+            return self._no_match
+
+    def score_value(self, ctx: PlateContext) -> float:
+        return len(self._find_abab(ctx.digits)) * self.abab_score * self.weight
+
+    def score_features(self, batch: PlateBatch):
+        feats = batch.features
+        return feats[:, _F_ABAB] * self.abab_score * self.weight
+
+    def max_value(self, ctx: PlateContext) -> float:
+        return _count_bound(len(ctx.digits) - 3, self.abab_score, self.weight)
+
+    @staticmethod
+    def _find_abab(digits: str) -> List[str]:
+        """按出现顺序返回所有ABAB片段"""
+        abab_patterns = []
+        for i in range(len(digits) - 3):
+            if (
+                digits[i] == digits[i + 2]
+                and digits[i + 1] == digits[i + 3]
+                and digits[i] != digits[i + 1]
+            ):
+                abab_patterns.append(digits[i : i + 4])
+        return abab_patterns
 
 
 class PlateScorer:
     """车牌评分器"""
 
+    # score_plate 最多缓存的车牌数
+    SCORE_CACHE_SIZE = 10000
+
     def __init__(self):
         self.rules: List[ScoringRule] = []
+        # 规则对同一车牌的评分是确定的，重复评分的车牌直接复用缓存结果；
+        # 缓存键带上规则版本号，增删规则后旧结果不会再被命中
+        self._rules_version = 0
+        self._score_cached = functools.lru_cache(maxsize=self.SCORE_CACHE_SIZE)(
+            self._score_versioned
+        )
 
     def add_rule(self, rule: ScoringRule):
         """添加评分规则"""
         self.rules.append(rule)
+        self.clear_cache()
 
     def remove_rule(self, rule_name: str):
         """移除评分规则"""
         self.rules = [r for r in self.rules if r.name != rule_name]
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        清空 score_plate 的结果缓存
+
+        add_rule/remove_rule 会自动调用；修改规则的 weight、分值参数，或直接
+        修改 rules 列表后需手动调用。
+        """
+        self._rules_version += 1
+        self._score_cached.cache_clear()
 
     def score_plate(self, plate_number: str) -> Tuple[float, List[ScoreResult]]:
         """
         对车牌进行评分
 
+        同一车牌的结果会被缓存，各次调用返回的 ScoreResult 对象是共享的，不应修改。
+        add_rule/remove_rule 后缓存自动失效；修改规则的 weight、分值参数，或直接
+        修改 rules 列表后需调用 clear_cache()，否则会返回修改前的结果。
+
         参数:
             plate_number: 车牌号码
 
         返回:
             (总分, 各规则评分详情列表)
         """
-        results = []
+        total_score, results = self._score_cached(self._rules_version, plate_number)
+        return total_score, list(results)
+
+    def _score_versioned(
+        self, rules_version: int, plate_number: str
+    ) -> Tuple[float, List[ScoreResult]]:
+        """被缓存的 _score_plate，rules_version 只用作缓存键的一部分"""
+        return self._score_plate(plate_number)
+
+    def _score_plate(self, plate_number: str) -> Tuple[float, List[ScoreResult]]:
+        """score_plate 的实际计算，结果被缓存，列表只以副本形式交给调用方"""
+        # 数字/字母只提取一次，所有规则共享
+        ctx = PlateContext(plate_number)
+
+        # 一次性生成结果列表，再按规则顺序累加总分；数字位数不够的规则不必调用
+        digit_count = len(ctx.digits)
+        results = [
+            rule.score_with_context(plate_number, ctx)
+            if digit_count >= rule.min_digits
+            else rule._few_digits
+            for rule in self.rules
+        ]
         total_score = 0.0
-
-        for rule in self.rules:
-            result = rule.calculate_score(plate_number)
-            results.append(result)
+        for result in results:
             total_score += result.score
 
         return total_score, results
 
+    def score_plate_fast(self, plate_number: str) -> float:
+        """
+        只计算总分，不生成评分详情
+
+        各规则通过 score_value 返回数值，省去 ScoreResult 与原因文本的构造，
+        适合只需要排序的大批量场景。结果与 score_plate 返回的总分一致。
+
+        参数:
+            plate_number: 车牌号码
+
+        返回:
+            总分
+        """
+        ctx = PlateContext(plate_number)
+        digit_count = len(ctx.digits)
+        total_score = 0.0
+        for rule in self.rules:
+            # 数字位数不够的规则得0分，跳过不影响总分
+            if digit_count >= rule.min_digits:
+                total_score += rule.score_value(ctx)
+        return total_score
+
+    def top_k(self, plate_numbers: List[str], k: int = 5) -> List[Tuple[str, float]]:
+        """
+        返回总分最高的 k 个车牌，结果与按总分稳定降序排序后取前 k 个相同
+
+        用大小为 k 的最小堆保存当前前 k 名。堆满后，每条规则计算前先用
+        max_value 估算剩余规则能得到的最高总分，若已无法超过第 k 名就放弃该车牌。
+
+        参数:
+            plate_numbers: 车牌号码列表
+            k: 返回的数量
+
+        返回:
+            [(车牌号码, 总分), ...]，按总分从高到低
+        """
+        if k <= 0:
+            return []
+
+        # 堆元素为 (总分, -序号, 车牌)，同分时序号靠前者排名更高
+        heap: List[Tuple[float, int, str]] = []
+
+        for index, plate_number in enumerate(plate_numbers):
+            if len(heap) < k:
+                total_score = self.score_plate_fast(plate_number)
+                heapq.heappush(heap, (total_score, -index, plate_number))
+                continue
+
+            threshold = heap[0][0]
+            ctx = PlateContext(plate_number)
+            # 数字位数不够的规则必得0分，上限记为0且不必计算
+            active = [len(ctx.digits) >= rule.min_digits for rule in self.rules]
+            bounds = [
+                rule.max_value(ctx) if is_active else 0
+                for rule, is_active in zip(self.rules, active)
+            ]
+
+            total_score = 0.0
+            for i, rule in enumerate(self.rules):
+                # 与真实总分按相同顺序累加上限，保证浮点舍入下仍是上界
+                upper = total_score
+                for bound in bounds[i:]:
+                    upper += bound
+                if upper <= threshold:
+                    break
+                if active[i]:
+                    total_score += rule.score_value(ctx)
+            else:
+                if total_score > threshold:
+                    heapq.heapreplace(heap, (total_score, -index, plate_number))
+
+        return [(plate, total) for total, _, plate in sorted(heap, reverse=True)]
+
+    def score_totals(self, plate_numbers: List[str]):
+        """
+        批量计算总分（不生成评分详情），结果与逐个调用 score_plate_fast 相同
+
+        支持的内置规则整批向量化计算，其余规则逐个计算；数字含全角等
+        非 ASCII 字符的车牌整个逐个计算。适合对大量候选车牌排序。
+
+        参数:
+            plate_numbers: 车牌号码列表
+
+        返回:
+            与输入一一对应的总分数组 (float64)
+        """
+        import numpy as np
+
+        if not plate_numbers:
+            return np.zeros(0)
+
+        batch = PlateBatch(plate_numbers)
+        totals = np.zeros(len(batch))
+        for rule in self.rules:
+            totals += rule.score_values(batch)
+        # 含非 ASCII 数字的车牌无法打包，逐个计算
+        for i in batch.non_ascii:
+            totals[i] = self.score_plate_fast(plate_numbers[i])
+        return totals
+
+    def score_many(
+        self, plate_numbers: List[str]
+    ) -> List[Tuple[float, List[ScoreResult]]]:
+        """
+        批量评分，结果与逐个调用 score_plate 相同
+
+        车牌数字只打包一次为 NumPy 数组，支持向量化的规则整批计算；
+        数字含全角等非 ASCII 字符的车牌改为逐个调用 score_plate。
+
+        参数:
+            plate_numbers: 车牌号码列表
+
+        返回:
+            与输入一一对应的 (总分, 各规则评分详情列表)
+        """
+        if not plate_numbers:
+            return []
+
+        batch = PlateBatch(plate_numbers)
+        per_rule = [rule.calculate_many(batch) for rule in self.rules]
+
+        scored = []
+        for i in range(len(batch)):
+            results = [rule_results[i] for rule_results in per_rule]
+            total_score = 0.0
+            for result in results:
+                total_score += result.score
+            scored.append((total_score, results))
+        # 含非 ASCII 数字的车牌无法打包，逐个评分
+        for i in batch.non_ascii:
+            scored[i] = self.score_plate(plate_numbers[i])
+        return scored
+
 
 def load_config(config_path: str = "scoring_rules.json") -> Optional[Dict]:
     """
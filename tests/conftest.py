@@ -0,0 +1,77 @@
+"""pytest 公共配置与夹具"""
+
+import io
+import os
+import random
+import string
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import plate_scorer  # noqa: E402
+import add_custom_rule  # noqa: E402
+
+CONFIG_PATH = os.path.join(ROOT, "scoring_rules.json")
+
+try:
+    import numba  # noqa: F401
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def feature_path(request, monkeypatch):
+    """分别用 numba 编译内核和纯 NumPy/Python 版本计算批量结果"""
+    if request.param == "numba":
+        if not HAS_NUMBA:
+            pytest.skip("未安装 numba")
+    else:
+        monkeypatch.setattr(plate_scorer, "_FEATURE_KERNEL", [None])
+        monkeypatch.setattr(
+            add_custom_rule,
+            "_KERNELS",
+            {"_palindrome_spans": None, "_pattern_starts": None},
+        )
+    return request.param
+
+
+def make_plates(seed: int, count: int, max_len: int = 10):
+    """生成随机车牌（含空串、无数字、超长数字等边界情况）"""
+    rng = random.Random(seed)
+    alphabet = "ABMJ" + string.digits * 3
+    plates = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+        for _ in range(count)
+    ]
+    plates += ["", "A", "1", "12", "121", "1221", "12321", "1111"]
+    plates += ["0123456789", "9876543210", "CD112233", "CD1212", "CD88888"]
+    return plates
+
+
+def perturb(scorer, seed: int):
+    """把规则权重和分值参数随机改为正负不同的值"""
+    rng = random.Random(seed)
+    for rule in scorer.rules:
+        rule.weight = rng.choice([-1.5, 0.3, 2.0, 0.1])
+        for attr in list(vars(rule)):
+            if attr.endswith(("score", "bonus", "count")):
+                setattr(rule, attr, rng.choice([-7.1, 0.1, 3.3, 0.7]))
+    return scorer
+
+
+@pytest.fixture(params=["default", "custom", "perturbed"])
+def scorer(request):
+    """默认规则、加上示例自定义规则、随机正负权重三种评分器"""
+    if request.param == "default":
+        return plate_scorer.create_default_scorer(CONFIG_PATH)
+    if request.param == "custom":
+        with redirect_stdout(io.StringIO()):
+            custom = add_custom_rule.create_custom_scorer()
+        return custom
+    return perturb(plate_scorer.create_default_scorer(CONFIG_PATH), seed=7)
@@ -0,0 +1,48 @@
+"""测试批量评分（score_many / score_totals）及 score_plate_fast 与 score_plate 结果一致"""
+
+from conftest import make_plates
+
+
+def details(results):
+    return [(r.rule_name, r.score, r.reason) for r in results]
+
+
+def test_score_plate_fast(scorer):
+    """只算总分的快速路径与 score_plate 的总分完全相同"""
+    for plate in make_plates(seed=1, count=3000):
+        assert scorer.score_plate_fast(plate) == scorer.score_plate(plate)[0], plate
+
+
+def test_score_many(scorer, feature_path):
+    """批量评分的总分和每条规则的得分、原因都与逐个评分相同"""
+    plates = make_plates(seed=2, count=3000)
+    for plate, (total, results) in zip(plates, scorer.score_many(plates)):
+        expected_total, expected_results = scorer.score_plate(plate)
+        assert total == expected_total, plate
+        assert details(results) == details(expected_results), plate
+
+
+def test_score_totals(scorer, feature_path):
+    """批量总分与逐个调用 score_plate_fast 相同"""
+    plates = make_plates(seed=3, count=3000)
+    totals = scorer.score_totals(plates)
+    assert totals.tolist() == [scorer.score_plate_fast(p) for p in plates]
+
+
+def test_empty_batch(scorer):
+    assert scorer.score_many([]) == []
+    assert len(scorer.score_totals([])) == 0
+
+
+def test_non_ascii_digits(scorer, feature_path):
+    """数字含全角字符的车牌不能打包进批量数组，应逐个评分且结果一致"""
+    plates = ["CD１２３４", "CD12345", "京A88888", "ＣＤ１６８２８", "CD１2１"]
+
+    many = scorer.score_many(plates)
+    totals = scorer.score_totals(plates)
+
+    for plate, (total, results), batch_total in zip(plates, many, totals):
+        expected_total, expected_results = scorer.score_plate(plate)
+        assert total == expected_total
+        assert details(results) == details(expected_results)
+        assert batch_total == expected_total
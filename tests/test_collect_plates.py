@@ -0,0 +1,70 @@
+"""测试 collect_plates 的网格去重与逐个比较的结果相同"""
+
+import random
+
+from analyze_plates import DEDUP_TOLERANCE, _PLATE_RE, _clean_text, collect_plates
+
+
+def linear_dedup(results):
+    """逐个与已接受车牌比较的去重（网格加速前的做法）"""
+    plate_dict = {}
+    for bbox, text, confidence in results:
+        if confidence < 0.5:
+            continue
+        text_clean = _clean_text(text)
+        if not _PLATE_RE.fullmatch(text_clean):
+            continue
+        center_x = sum(point[0] for point in bbox) / 4
+        center_y = sum(point[1] for point in bbox) / 4
+
+        is_duplicate = False
+        for existing in plate_dict:
+            if (
+                abs(center_x - existing[0]) < DEDUP_TOLERANCE
+                and abs(center_y - existing[1]) < DEDUP_TOLERANCE
+            ):
+                if confidence > plate_dict[existing][1]:
+                    del plate_dict[existing]
+                else:
+                    is_duplicate = True
+                break
+
+        if not is_duplicate:
+            plate_dict[(center_x, center_y)] = (text_clean, confidence)
+    return [
+        (text, confidence, (int(cx), int(cy)))
+        for (cx, cy), (text, confidence) in plate_dict.items()
+    ]
+
+
+def make_results(seed: int, count: int):
+    """在小范围内随机放置车牌框，使大量结果位置互相重叠"""
+    rng = random.Random(seed)
+    texts = ["CD88888", "cd 12345", "AB1234", "HELLO", "12345", "CDP5747", "X"]
+    results = []
+    for _ in range(count):
+        x = rng.uniform(0, 300)
+        y = rng.uniform(0, 300)
+        w = rng.uniform(20, 120)
+        h = rng.uniform(10, 40)
+        bbox = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+        results.append((bbox, rng.choice(texts), round(rng.uniform(0.3, 1.0), 2)))
+    return results
+
+
+def test_matches_linear_dedup(capsys):
+    for seed in range(50):
+        results = make_results(seed, count=random.Random(seed).randint(0, 80))
+        plates = collect_plates(results)
+        got = [(p.plate_number, p.confidence, p.center_pos) for p in plates]
+        assert got == linear_dedup(results), seed
+
+
+def test_keeps_higher_confidence(capsys):
+    box = [[0, 0], [100, 0], [100, 30], [0, 30]]
+    near = [[10, 5], [110, 5], [110, 35], [10, 35]]
+    far = [[500, 500], [600, 500], [600, 530], [500, 530]]
+    plates = collect_plates(
+        [(box, "CD12345", 0.6), (near, "CD12845", 0.9), (far, "AB88888", 0.8)]
+    )
+    assert [p.plate_number for p in plates] == ["CD12845", "AB88888"]
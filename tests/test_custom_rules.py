@@ -0,0 +1,49 @@
+"""测试自定义规则: 旧版 calculate_score 签名与示例规则"""
+
+import io
+from contextlib import redirect_stdout
+
+from conftest import CONFIG_PATH, make_plates
+from add_custom_rule import create_custom_scorer
+from plate_scorer import ScoreResult, ScoringRule, create_default_scorer
+
+
+class LegacyRule(ScoringRule):
+    """按旧版签名编写的规则，calculate_score 只接受车牌号码"""
+
+    def __init__(self):
+        super().__init__("旧版规则", weight=1.0)
+
+    def calculate_score(self, plate_number: str) -> ScoreResult:
+        digits = self.extract_digits(plate_number)
+        return ScoreResult(self.name, 3.0 * digits.count("8"), "旧版")
+
+
+def test_legacy_signature():
+    scorer = create_default_scorer(CONFIG_PATH)
+    plates = make_plates(seed=8, count=500)
+    base = {plate: scorer.score_plate(plate)[0] for plate in plates}
+
+    scorer.add_rule(LegacyRule())
+    for plate in plates:
+        want = base[plate] + 3.0 * plate.count("8")
+        total, results = scorer.score_plate(plate)
+        assert total == want
+        assert results[-1].reason == "旧版"
+        assert scorer.score_plate_fast(plate) == want
+
+    expected = [base[p] + 3.0 * p.count("8") for p in plates]
+    assert scorer.score_totals(plates).tolist() == expected
+    assert [total for total, _ in scorer.score_many(plates)] == expected
+
+    ranked = sorted(zip(plates, expected), key=lambda item: item[1], reverse=True)
+    assert scorer.top_k(plates, 3) == ranked[:3]
+
+
+def test_custom_scorer_full_width_digits():
+    """示例自定义规则支持全角数字"""
+    with redirect_stdout(io.StringIO()):
+        scorer = create_custom_scorer()
+    total, results = scorer.score_plate("CD１２３４５")
+    assert total == 85.0
+    assert "ABC模式 １２３ (+20)" in [r.reason for r in results]
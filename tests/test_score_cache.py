@@ -0,0 +1,84 @@
+"""测试 score_plate 结果缓存在规则变化后失效"""
+
+from conftest import CONFIG_PATH
+from plate_scorer import Rule3_Lucky68, create_default_scorer
+
+PLATE = "CD88888"
+
+
+def fresh_total(scorer):
+    """不经过缓存直接计算的总分"""
+    return scorer._score_plate(PLATE)[0]
+
+
+def test_repeated_calls_return_copies():
+    scorer = create_default_scorer(CONFIG_PATH)
+    total, results = scorer.score_plate(PLATE)
+    results.clear()
+    again_total, again_results = scorer.score_plate(PLATE)
+    assert again_total == total
+    assert len(again_results) == len(scorer.rules)
+
+
+def test_add_and_remove_rule():
+    scorer = create_default_scorer(CONFIG_PATH)
+    before = scorer.score_plate(PLATE)[0]
+
+    scorer.add_rule(Rule3_Lucky68(lucky_digit_score=100))
+    added = scorer.score_plate(PLATE)[0]
+    assert added == fresh_total(scorer) == before + 500
+
+    scorer.remove_rule("吉祥数字6/8")
+    removed = scorer.score_plate(PLATE)[0]
+    assert removed == fresh_total(scorer)
+    assert len(scorer.score_plate(PLATE)[1]) == len(scorer.rules)
+
+
+def test_rule_attribute_changes_after_clear_cache():
+    """修改权重或分值参数后调用 clear_cache，不再返回修改前的结果"""
+    scorer = create_default_scorer(CONFIG_PATH)
+    before = scorer.score_plate(PLATE)[0]
+    lucky = next(r for r in scorer.rules if r.name == "吉祥数字6/8")
+
+    lucky.weight = 2.0
+    assert scorer.score_plate(PLATE)[0] == before  # 未清空时仍为缓存结果
+    scorer.clear_cache()
+    assert scorer.score_plate(PLATE)[0] == fresh_total(scorer) != before
+
+    lucky.lucky_digit_score = 1
+    scorer.clear_cache()
+    assert scorer.score_plate(PLATE)[0] == fresh_total(scorer)
+
+
+def test_rules_list_edited_directly():
+    scorer = create_default_scorer(CONFIG_PATH)
+    scorer.score_plate(PLATE)
+
+    scorer.rules[2] = Rule3_Lucky68(lucky_digit_score=100)
+    scorer.clear_cache()
+    assert scorer.score_plate(PLATE)[0] == fresh_total(scorer)
+
+    scorer.rules = scorer.rules[:3]
+    scorer.clear_cache()
+    assert scorer.score_plate(PLATE)[0] == fresh_total(scorer)
+    assert len(scorer.score_plate(PLATE)[1]) == 3
+
+
+def test_other_rules_and_scorers_keep_cache():
+    """创建其他规则或评分器不影响已有评分器的缓存"""
+    scorer = create_default_scorer(CONFIG_PATH)
+    scorer.score_plate(PLATE)
+    scorer.score_plate(PLATE)
+    assert scorer._score_cached.cache_info().hits == 1
+
+    create_default_scorer(CONFIG_PATH)
+    Rule3_Lucky68()
+    scorer.score_plate(PLATE)
+    assert scorer._score_cached.cache_info().hits == 2
+
+
+def test_scorers_do_not_share_cache():
+    plain = create_default_scorer(CONFIG_PATH)
+    boosted = create_default_scorer(CONFIG_PATH)
+    boosted.add_rule(Rule3_Lucky68(lucky_digit_score=100))
+    assert boosted.score_plate(PLATE)[0] == plain.score_plate(PLATE)[0] + 500
@@ -0,0 +1,50 @@
+"""测试 PlateScorer.top_k 与完整稳定排序后取前 k 个的结果相同"""
+
+import random
+
+import pytest
+
+from conftest import CONFIG_PATH, make_plates
+from plate_scorer import PlateContext, create_default_scorer
+
+
+def expected_top_k(scorer, plates, k):
+    """按总分稳定降序排序（同分保持输入顺序）后取前 k 个"""
+    scored = [(plate, scorer.score_plate(plate)[0]) for plate in plates]
+    return sorted(scored, key=lambda item: item[1], reverse=True)[: max(k, 0)]
+
+
+@pytest.mark.parametrize("k", [-1, 0, 1, 5, 50])
+def test_matches_stable_sort(scorer, k):
+    plates = make_plates(seed=4, count=2000, max_len=8)
+    assert scorer.top_k(plates, k) == expected_top_k(scorer, plates, k)
+
+
+def test_random_batches(scorer):
+    """多组随机大小的输入（含空列表、k 大于车牌数）"""
+    rng = random.Random(5)
+    for trial in range(100):
+        plates = make_plates(seed=trial, count=rng.randint(0, 200), max_len=8)
+        plates = plates[: rng.randint(0, len(plates))]
+        k = rng.randint(0, 8)
+        assert scorer.top_k(plates, k) == expected_top_k(scorer, plates, k)
+
+
+def test_ties_keep_input_order():
+    """同分车牌按输入顺序排名，包括与堆顶同分时不替换已入选的车牌"""
+    scorer = create_default_scorer(CONFIG_PATH)
+    plates = ["CD88888", "AB88888", "CD12345", "XY88888", "CD88888", "ZZ12345"]
+    assert scorer.top_k(plates, 2) == expected_top_k(scorer, plates, 2)
+    assert [plate for plate, _ in scorer.top_k(plates, 3)] == [
+        "CD88888",
+        "AB88888",
+        "XY88888",
+    ]
+
+
+def test_max_value_is_upper_bound(scorer):
+    """剪枝用的 max_value 不小于真实得分"""
+    for plate in make_plates(seed=6, count=2000):
+        ctx = PlateContext(plate)
+        for rule in scorer.rules:
+            assert rule.max_value(ctx) >= rule.score_value(ctx), (rule.name, plate)